@@ -1,13 +1,29 @@
-def read_and_modify_file():
+from demo_output import Output, output_from_args
+
+def transform_content(content):
+    """Convert text to uppercase and prefix each line with its line number."""
+    modified_lines = []
+    lines = content.split('\n')
+    
+    for i, line in enumerate(lines, 1):
+        modified_line = f"{i:3d}. {line.upper()}"
+        modified_lines.append(modified_line)
+    
+    return '\n'.join(modified_lines)
+
+def read_and_modify_file(out=None):
     """
     Reads a file, modifies its content, and writes to a new file.
     Handles various file-related errors gracefully.
     """
+    if out is None:
+        with Output() as out:
+            return read_and_modify_file(out=out)
     
     # Get filename from user with error handling
     while True:
         try:
-            filename = input("Enter the filename to read: ")
+            filename = out.prompt("Enter the filename to read: ")
             
             # Try to open and read the file
             with open(filename, 'r', encoding='utf-8') as file:
@@ -17,45 +33,38 @@ def read_and_modify_file():
             break
             
         except FileNotFoundError:
-            print(f"Error: The file '{filename}' was not found. Please try again.")
+            out.line("Error: The file '{}' was not found. Please try again.", filename)
         except PermissionError:
-            print(f"Error: Permission denied to read '{filename}'. Please check file permissions.")
+            out.line("Error: Permission denied to read '{}'. Please check file permissions.", filename)
         except UnicodeDecodeError:
-            print(f"Error: Unable to decode '{filename}'. Please ensure it's a text file.")
+            out.line("Error: Unable to decode '{}'. Please ensure it's a text file.", filename)
             try:
                 # Try with different encoding
                 with open(filename, 'r', encoding='latin-1') as file:
                     content = file.read()
-                print("File read successfully with alternative encoding.")
+                out.line("File read successfully with alternative encoding.")
                 break
             except:
-                print("Still unable to read the file. Please try another file.")
+                out.line("Still unable to read the file. Please try another file.")
         except IsADirectoryError:
-            print(f"Error: '{filename}' is a directory, not a file. Please enter a filename.")
+            out.line("Error: '{}' is a directory, not a file. Please enter a filename.", filename)
         except Exception as e:
-            print(f"Unexpected error: {e}. Please try again.")
+            out.line("Unexpected error: {}. Please try again.", e)
     
     # Modify the content (example: convert to uppercase and add line numbers)
-    modified_lines = []
-    lines = content.split('\n')
-    
-    for i, line in enumerate(lines, 1):
-        modified_line = f"{i:3d}. {line.upper()}"
-        modified_lines.append(modified_line)
-    
-    modified_content = '\n'.join(modified_lines)
+    modified_content = transform_content(content)
     
     # Get output filename from user
     while True:
         try:
-            output_filename = input("Enter the output filename: ")
+            output_filename = out.prompt("Enter the output filename: ")
             
             # Check if file already exists
             try:
                 with open(output_filename, 'r'):
-                    overwrite = input(f"File '{output_filename}' already exists. Overwrite? (y/n): ").lower()
+                    overwrite = out.prompt(f"File '{output_filename}' already exists. Overwrite? (y/n): ").lower()
                     if overwrite != 'y':
-                        print("Please choose a different filename.")
+                        out.line("Please choose a different filename.")
                         continue
             except FileNotFoundError:
                 pass  # File doesn't exist, which is good
@@ -64,53 +73,60 @@ def read_and_modify_file():
             with open(output_filename, 'w', encoding='utf-8') as file:
                 file.write(modified_content)
             
-            print(f"Success! Modified content written to '{output_filename}'")
+            out.line("Success! Modified content written to '{}'", output_filename)
             break
             
         except PermissionError:
-            print(f"Error: Permission denied to write to '{output_filename}'. Please choose a different filename.")
+            out.line("Error: Permission denied to write to '{}'. Please choose a different filename.", output_filename)
         except Exception as e:
-            print(f"Error writing to file: {e}. Please try again.")
+            out.line("Error writing to file: {}. Please try again.", e)
 
-def display_file_preview(filename, num_lines=5):
+def display_file_preview(filename, num_lines=5, out=None):
     """Display a preview of the file content."""
+    if out is None:
+        with Output() as out:
+            return display_file_preview(filename, num_lines, out=out)
     try:
         with open(filename, 'r', encoding='utf-8') as file:
             lines = file.readlines()
         
-        print(f"\nPreview of '{filename}':")
-        print("─" * 50)
+        out.line("\nPreview of '{}':", filename)
+        out.line("─" * 50)
         for i, line in enumerate(lines[:num_lines], 1):
-            print(f"{i}: {line.rstrip()}")
+            out.line("{}: {}", i, line.rstrip())
         if len(lines) > num_lines:
-            print(f"... and {len(lines) - num_lines} more lines")
-        print("─" * 50)
+            out.line("... and {} more lines", len(lines) - num_lines)
+        out.line("─" * 50)
         
     except Exception as e:
-        print(f"Could not display preview: {e}")
+        out.line("Could not display preview: {}", e)
 
-def main():
+def main(out=None):
     """Main program function."""
-    print("📁 File Read & Write Program 📁")
-    print("This program reads a file, modifies it, and saves a new version.")
-    print("=" * 60)
+    if out is None:
+        with Output() as out:
+            return main(out=out)
+    out.line("📁 File Read & Write Program 📁")
+    out.line("This program reads a file, modifies it, and saves a new version.")
+    out.line("=" * 60)
     
     try:
-        read_and_modify_file()
+        read_and_modify_file(out)
         
         # Optional: Ask if user wants to see a preview
-        preview = input("\nWould you like to see a preview of the output file? (y/n): ").lower()
+        preview = out.prompt("\nWould you like to see a preview of the output file? (y/n): ").lower()
         if preview == 'y':
-            output_filename = input("Enter the output filename to preview: ")
-            display_file_preview(output_filename)
+            output_filename = out.prompt("Enter the output filename to preview: ")
+            display_file_preview(output_filename, out=out)
             
     except KeyboardInterrupt:
-        print("\n\nProgram interrupted by user. Goodbye!")
+        out.line("\n\nProgram interrupted by user. Goodbye!")
     except Exception as e:
-        print(f"\nAn unexpected error occurred: {e}")
+        out.line("\nAn unexpected error occurred: {}", e)
     finally:
-        print("\nThank you for using the File Read & Write Program! 📝")
+        out.line("\nThank you for using the File Read & Write Program! 📝")
+        out.flush()
 
 # Run the program
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main(output_from_args())
\ No newline at end of file
@@ -3,6 +3,447 @@ Smartphone Class Implementation with OOP Concepts
 Demonstrating: Classes, Constructors, Inheritance, Polymorphism, and Encapsulation
 """
 
+import functools
+import time
+from array import array
+from bisect import bisect_left, insort
+from collections import namedtuple
+
+from demo_output import Event, EventType, Output, output_from_args
+from instrumentation import profiled
+
+
+class AppRegistry:
+    """
+    Installed apps for a single device.
+    Keeps an app -> size index and a running storage total so that
+    membership checks, installs and uninstalls are all O(1).
+    """
+    
+    def __init__(self, capacity_mb):
+        self._capacity_mb = capacity_mb
+        self._sizes = {}                       # app name -> size in MB
+        self._used_mb = 0
+        self._watchers = []                    # callbacks(app_name, installed)
+    
+    def __len__(self):
+        return len(self._sizes)
+    
+    def __contains__(self, app_name):
+        return app_name in self._sizes
+    
+    def __iter__(self):
+        return iter(self._sizes)
+    
+    @property
+    def used_mb(self):
+        return self._used_mb
+    
+    @property
+    def available_mb(self):
+        return self._capacity_mb - self._used_mb
+    
+    def size_of(self, app_name):
+        """Size in MB of an installed app, or None if not installed"""
+        return self._sizes.get(app_name)
+    
+    def add_watcher(self, callback):
+        """Register callback(app_name, installed) for install/uninstall events"""
+        self._watchers.append(callback)
+    
+    def remove_watcher(self, callback):
+        """Stop calling a callback registered with add_watcher"""
+        self._watchers.remove(callback)
+    
+    def add(self, app_name, size_mb):
+        """Record an install; returns False if it doesn't fit or is already present"""
+        if app_name in self._sizes or size_mb > self.available_mb:
+            return False
+        self._sizes[app_name] = size_mb
+        self._used_mb += size_mb
+        for callback in self._watchers:
+            callback(app_name, True)
+        return True
+    
+    def remove(self, app_name):
+        """Record an uninstall; returns the freed size in MB or None"""
+        size_mb = self._sizes.pop(app_name, None)
+        if size_mb is None:
+            return None
+        self._used_mb -= size_mb
+        for callback in self._watchers:
+            callback(app_name, False)
+        return size_mb
+
+
+class _AppendOnlyLog:
+    """
+    Base for compact append-only histories.
+    Entries live in parallel columns (typed arrays where possible) next to
+    a float timestamp column. With max_entries set the columns act as a
+    ring buffer and the oldest entries are overwritten; max_entries=0
+    keeps nothing and only counts appends.
+    Timestamps are expected to be non-decreasing.
+    """
+    
+    def __init__(self, columns, max_entries=None):
+        if max_entries is not None and max_entries < 0:
+            raise ValueError("max_entries must be None or >= 0")
+        self._max_entries = max_entries
+        self._times = array('d')
+        self._columns = columns
+        self._start = 0                        # physical slot of the oldest entry
+        self._total = 0                        # entries ever appended
+    
+    def __len__(self):
+        """Number of retained entries"""
+        return len(self._times)
+    
+    @property
+    def total(self):
+        """Number of entries ever appended, including overwritten ones"""
+        return self._total
+    
+    def _append(self, timestamp, values):
+        if timestamp is None:
+            timestamp = time.time()
+        if self._max_entries is None or len(self._times) < self._max_entries:
+            self._times.append(timestamp)
+            for column, value in zip(self._columns, values):
+                column.append(value)
+        elif self._max_entries:
+            slot = self._start
+            self._times[slot] = timestamp
+            for column, value in zip(self._columns, values):
+                column[slot] = value
+            self._start = (slot + 1) % self._max_entries
+        self._total += 1
+    
+    def _slot(self, index):
+        """Physical slot of the index-th oldest retained entry"""
+        return (self._start + index) % len(self._times)
+    
+    def _time_at(self, index):
+        return self._times[self._slot(index)]
+    
+    def _bisect(self, timestamp):
+        """First logical index whose timestamp is >= timestamp"""
+        lo, hi = 0, len(self._times)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._time_at(mid) < timestamp:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+    
+    def _indexes(self, start_time=None, end_time=None):
+        """Logical indexes of entries with start_time <= timestamp < end_time"""
+        lo = 0 if start_time is None else self._bisect(start_time)
+        hi = len(self._times) if end_time is None else self._bisect(end_time)
+        return range(lo, hi)
+
+
+class MessageLog(_AppendOnlyLog):
+    """
+    Sent-message history.
+    Recipient numbers are interned into an integer table so each message
+    costs a timestamp, a recipient id and a reference to its text. With
+    max_entries set, each id counts its retained messages and is freed for
+    reuse once the last one is overwritten, so the table stays bounded by
+    the ring size rather than by every number ever messaged.
+    """
+    
+    def __init__(self, max_entries=None):
+        self._recipients = array('I')
+        self._bodies = []
+        super().__init__([self._recipients, self._bodies], max_entries)
+        self._numbers = []                     # recipient id -> number (None when freed)
+        self._number_ids = {}                  # number -> recipient id
+        self._counts = array('I') if max_entries else None   # recipient id -> retained messages
+        self._free_ids = []
+    
+    def append(self, number, message, timestamp=None):
+        """Record a message sent to number"""
+        if self._max_entries == 0:
+            self._append(timestamp, ())
+            return
+        number_id = self._number_ids.get(number)
+        if number_id is None:
+            if self._free_ids:
+                number_id = self._free_ids.pop()
+                self._numbers[number_id] = number
+            else:
+                number_id = len(self._numbers)
+                self._numbers.append(number)
+                if self._counts is not None:
+                    self._counts.append(0)
+            self._number_ids[number] = number_id
+        counts = self._counts
+        if counts is not None:
+            counts[number_id] += 1
+            if len(self._times) == self._max_entries:
+                # The oldest message is about to be overwritten
+                old_id = self._recipients[self._start]
+                counts[old_id] -= 1
+                if not counts[old_id]:
+                    del self._number_ids[self._numbers[old_id]]
+                    self._numbers[old_id] = None
+                    self._free_ids.append(old_id)
+        self._append(timestamp, (number_id, message))
+    
+    def window(self, start_time=None, end_time=None):
+        """Yield (timestamp, number, message) for messages in [start_time, end_time)"""
+        for index in self._indexes(start_time, end_time):
+            slot = self._slot(index)
+            yield (self._times[slot],
+                   self._numbers[self._recipients[slot]],
+                   self._bodies[slot])
+    
+    def __iter__(self):
+        return self.window()
+    
+    def recipients(self):
+        """Every number with a retained message"""
+        return [number for number in self._numbers if number is not None]
+
+
+class PhotoLog(_AppendOnlyLog):
+    """
+    Photo history.
+    Filenames are not stored; they are rebuilt from a prefix id and the
+    photo's sequence number when read back.
+    """
+    
+    def __init__(self, max_entries=None):
+        self._kinds = array('B')
+        super().__init__([self._kinds], max_entries)
+        self._prefixes = []                    # kind id -> filename prefix
+        self._prefix_ids = {}
+    
+    def append(self, prefix="photo", timestamp=None):
+        """Record a photo and return its filename"""
+        kind = self._prefix_ids.get(prefix)
+        if kind is None:
+            kind = len(self._prefixes)
+            self._prefixes.append(prefix)
+            self._prefix_ids[prefix] = kind
+        self._append(timestamp, (kind,))
+        return f"{prefix}_{self._total}.jpg"
+    
+    def window(self, start_time=None, end_time=None):
+        """Yield (timestamp, filename) for photos in [start_time, end_time)"""
+        first_sequence = self._total - len(self._times) + 1
+        for index in self._indexes(start_time, end_time):
+            slot = self._slot(index)
+            prefix = self._prefixes[self._kinds[slot]]
+            yield self._times[slot], f"{prefix}_{first_sequence + index}.jpg"
+    
+    def __iter__(self):
+        return self.window()
+
+
+class ContactBook:
+    """
+    Name -> number contacts with a reverse number index for caller ID and
+    a sorted, case-insensitive name index for prefix (autocomplete) search.
+    """
+    
+    def __init__(self):
+        self._numbers = {}                     # name -> number
+        self._names_by_number = {}             # number -> set of names
+        self._sorted_names = []                # sorted (casefolded name, name)
+    
+    def __len__(self):
+        return len(self._numbers)
+    
+    def __contains__(self, name):
+        return name in self._numbers
+    
+    def __iter__(self):
+        """Yield (name, number) in name order"""
+        for _, name in self._sorted_names:
+            yield name, self._numbers[name]
+    
+    def _unlink_number(self, name, number):
+        names = self._names_by_number[number]
+        names.discard(name)
+        if not names:
+            del self._names_by_number[number]
+    
+    def add(self, name, number):
+        """Add a contact or change an existing contact's number"""
+        old_number = self._numbers.get(name)
+        if old_number is None:
+            insort(self._sorted_names, (name.casefold(), name))
+        else:
+            self._unlink_number(name, old_number)
+        self._numbers[name] = number
+        self._names_by_number.setdefault(number, set()).add(name)
+    
+    def remove(self, name):
+        """Remove a contact; returns its number or None"""
+        number = self._numbers.pop(name, None)
+        if number is None:
+            return None
+        self._unlink_number(name, number)
+        key = (name.casefold(), name)
+        del self._sorted_names[bisect_left(self._sorted_names, key)]
+        return number
+    
+    def import_contacts(self, contacts):
+        """
+        Add many (name, number) pairs at once.
+        The name index is rebuilt with a single sort instead of one
+        sorted insert per contact.
+        """
+        numbers = self._numbers
+        names_by_number = self._names_by_number
+        added = 0
+        for name, number in contacts:
+            old_number = numbers.get(name)
+            if old_number is None:
+                added += 1
+            else:
+                self._unlink_number(name, old_number)
+            numbers[name] = number
+            names_by_number.setdefault(number, set()).add(name)
+        self._sorted_names = sorted((name.casefold(), name) for name in numbers)
+        return added
+    
+    def number_for(self, name):
+        return self._numbers.get(name)
+    
+    def names_for(self, number):
+        """Caller ID: sorted names saved under number"""
+        return sorted(self._names_by_number.get(number, ()))
+    
+    def search(self, prefix, limit=None):
+        """Names starting with prefix (case-insensitive), in name order"""
+        prefix = prefix.casefold()
+        matches = []
+        index = bisect_left(self._sorted_names, (prefix,))
+        while index < len(self._sorted_names):
+            key, name = self._sorted_names[index]
+            if not key.startswith(prefix):
+                break
+            matches.append(name)
+            if limit is not None and len(matches) >= limit:
+                break
+            index += 1
+        return matches
+
+
+# Point-in-time view of a device, cached by Smartphone.status_snapshot()
+DeviceStatus = namedtuple("DeviceStatus", [
+    "imei", "full_name", "specs", "powered_on", "screen_locked",
+    "battery_level", "current_call", "apps", "contacts", "photos",
+])
+
+
+def render_status(status):
+    """Format a DeviceStatus as the multi-line text shown by get_status()"""
+    return "\n".join((
+        f"\n{status.full_name} Status:",
+        f"Specs: {status.specs}",
+        f"Power: {'ON' if status.powered_on else 'OFF'}",
+        f"Screen: {'Locked' if status.screen_locked else 'Unlocked'}",
+        f"Battery: {status.battery_level}%",
+        f"In call: {status.current_call if status.current_call else 'No'}",
+        f"Apps: {status.apps} installed",
+        f"Contacts: {status.contacts} saved",
+        f"Photos: {status.photos} taken",
+    ))
+
+
+def fleet_status(phones):
+    """
+    Columnar status table for many devices.
+    Returns a dict mapping each DeviceStatus field to a list with one
+    entry per phone, built from cached snapshots without any formatting.
+    """
+    columns = zip(*(phone.status_snapshot() for phone in phones))
+    table = {field: list(column) for field, column in zip(DeviceStatus._fields, columns)}
+    if not table:
+        table = {field: [] for field in DeviceStatus._fields}
+    return table
+
+
+class FleetAppIndex:
+    """
+    Inverted index from app name to the devices that have it installed.
+    Devices stay indexed as they install/uninstall, so "which devices have
+    app X" is a dict lookup instead of a scan over every phone.
+    Each registered device holds a watcher that refers back to the index;
+    unregister() devices that outlive it.
+    """
+    
+    def __init__(self, devices=()):
+        self._devices = {}                     # imei -> device
+        self._app_devices = {}                 # app name -> set of imei
+        self._watchers = {}                    # imei -> watcher on the device's AppRegistry
+        for device in devices:
+            self.register(device)
+    
+    def __len__(self):
+        return len(self._devices)
+    
+    def register(self, device):
+        """Start tracking a device (and the apps it already has)"""
+        imei = device.imei
+        if imei in self._devices:
+            return
+        self._devices[imei] = device
+        registry = device.installed_apps
+        for app_name in registry:
+            self._app_devices.setdefault(app_name, set()).add(imei)
+        watcher = functools.partial(self._update, imei)
+        self._watchers[imei] = watcher
+        registry.add_watcher(watcher)
+    
+    def unregister(self, device):
+        """Stop tracking a device and detach the index from it"""
+        imei = device.imei
+        if self._devices.pop(imei, None) is None:
+            return
+        registry = device.installed_apps
+        registry.remove_watcher(self._watchers.pop(imei))
+        for app_name in registry:
+            self._update(imei, app_name, False)
+    
+    def _update(self, imei, app_name, installed):
+        if installed:
+            self._app_devices.setdefault(app_name, set()).add(imei)
+        else:
+            holders = self._app_devices.get(app_name)
+            if holders is not None:
+                holders.discard(imei)
+                if not holders:
+                    del self._app_devices[app_name]
+    
+    def devices_with(self, app_name):
+        """List of devices that have app_name installed"""
+        return [self._devices[imei] for imei in self._app_devices.get(app_name, ())]
+    
+    def install_count(self, app_name):
+        """Number of devices that have app_name installed"""
+        return len(self._app_devices.get(app_name, ()))
+    
+    def apps(self):
+        """All app names installed on at least one tracked device"""
+        return list(self._app_devices)
+
+
+# Results returned by make_call() and play_game()
+CALLING = EventType("call", "📞 Calling {number}...", ("number",))
+CALL_DEVICE_OFF = Event((EventType("call", "❌ Cannot call - device off", ok=False),))
+CALL_LOW_BATTERY = Event((EventType("call", "❌ Cannot call - low battery", ok=False),))
+PLAYING = EventType("game", "🎮 Playing {game} at {refresh_rate}Hz", ("game", "refresh_rate"))
+GAME_DEVICE_OFF = Event((EventType("game", "❌ Cannot play game - device off", ok=False),))
+GAME_LOW_BATTERY = Event((EventType("game", "❌ Cannot play game - low battery", ok=False),))
+
+
+@profiled("_use_battery", "install_app", "get_status")
 class Smartphone:
     """
     Base class representing a smartphone with core functionality.
@@ -12,6 +453,10 @@ class Smartphone:
     # Class attribute (shared by all instances)
     device_count = 0
     
+    # History retention (None keeps everything, a number keeps the most recent)
+    message_history_limit = None
+    photo_history_limit = None
+    
     def __init__(self, brand, model, imei, storage_gb=64, ram_gb=4, os="Android"):
         """
         Constructor to initialize smartphone with unique values
@@ -30,11 +475,15 @@ class Smartphone:
         self._screen_locked = True
         self._current_call = None
         
+        # Cached status (reset to None whenever state changes)
+        self._status = None
+        self._status_text = None
+        
         # Content storage
-        self._installed_apps = []
-        self._contacts = {}
-        self._photos = []
-        self._messages = []
+        self._installed_apps = AppRegistry(storage_gb * 1024)
+        self._contacts = ContactBook()
+        self._photos = PhotoLog(self.photo_history_limit)
+        self._messages = MessageLog(self.message_history_limit)
         
         # Update class attribute
         Smartphone.device_count += 1
@@ -56,6 +505,15 @@ class Smartphone:
     def battery_level(self):
         return self._battery_level
     
+    @property
+    def installed_apps(self):
+        """The device's AppRegistry (read it; install through install_app)"""
+        return self._installed_apps
+    
+    @property
+    def current_call(self):
+        return self._current_call
+    
     @property
     def imei(self):
         return self._imei
@@ -68,6 +526,7 @@ class Smartphone:
         """Power on the smartphone"""
         if not self._powered_on and self._battery_level > 5:
             self._powered_on = True
+            self._status = None
             return f"📱 {self.full_name} powered ON"
         return "❌ Cannot power on - low battery"
     
@@ -76,6 +535,7 @@ class Smartphone:
         if self._powered_on:
             self._powered_on = False
             self._screen_locked = True
+            self._status = None
             return f"📱 {self.full_name} powered OFF"
         return "❌ Device already off"
     
@@ -83,24 +543,28 @@ class Smartphone:
         """Unlock the screen"""
         if self._powered_on and self._screen_locked:
             self._screen_locked = False
+            self._status = None
             return f"🔓 {self.full_name} unlocked"
         return "❌ Cannot unlock"
     
     def lock(self):
         """Lock the screen"""
         self._screen_locked = True
+        self._status = None
         return f"🔒 {self.full_name} locked"
     
     def charge(self, percentage):
         """Charge the battery"""
         if self._battery_level < 100:
             self._battery_level = min(100, self._battery_level + percentage)
+            self._status = None
             return f"⚡ Charging... {self._battery_level}%"
         return "✅ Battery full"
     
     def _use_battery(self, amount):
         """Private method for battery usage (encapsulation)"""
         self._battery_level = max(0, self._battery_level - amount)
+        self._status = None
         if self._battery_level <= 10:
             return f"⚠️ Low battery! {self._battery_level}% left"
         return f"🔋 Battery: {self._battery_level}%"
@@ -108,19 +572,20 @@ class Smartphone:
     def make_call(self, number):
         """Make a phone call"""
         if not self._powered_on:
-            return "❌ Cannot call - device off"
+            return CALL_DEVICE_OFF
         if self._battery_level < 5:
-            return "❌ Cannot call - low battery"
+            return CALL_LOW_BATTERY
         
         self._current_call = number
         self._use_battery(3)
-        return f"📞 Calling {number}..."
+        return Event((CALLING, number))
     
     def end_call(self):
         """End current call"""
         if self._current_call:
             number = self._current_call
             self._current_call = None
+            self._status = None
             return f"📞 Ended call with {number}"
         return "❌ No active call"
     
@@ -131,7 +596,7 @@ class Smartphone:
         if self._battery_level < 3:
             return "❌ Cannot send message - low battery"
         
-        self._messages.append({"to": number, "message": message})
+        self._messages.append(number, message)
         self._use_battery(1)
         return f"✉️ Message sent to {number}"
     
@@ -140,16 +605,39 @@ class Smartphone:
         if not self._powered_on:
             return "❌ Cannot install app - device off"
         
-        # Check storage (simplified)
-        used_storage = len(self._installed_apps) * 100
-        available = (self._storage_gb * 1024) - used_storage
+        if app_name in self._installed_apps:
+            return f"⚠️ {app_name} is already installed"
         
-        if size_mb <= available:
-            self._installed_apps.append(app_name)
+        if self._installed_apps.add(app_name, size_mb):
             self._use_battery(2)
             return f"📦 Installed {app_name}"
         return f"❌ Not enough storage for {app_name}"
     
+    def install_apps(self, apps):
+        """Install several apps at once from (app_name, size_mb) pairs"""
+        if not self._powered_on:
+            return "❌ Cannot install apps - device off"
+        
+        installed = 0
+        for app_name, size_mb in apps:
+            if self._installed_apps.add(app_name, size_mb):
+                installed += 1
+        if installed:
+            self._use_battery(2 * installed)
+        return f"📦 Installed {installed} apps"
+    
+    def uninstall_app(self, app_name):
+        """Uninstall an application and free its storage"""
+        size_mb = self._installed_apps.remove(app_name)
+        if size_mb is None:
+            return f"❌ {app_name} is not installed"
+        self._status = None
+        return f"🗑️ Uninstalled {app_name} ({size_mb}MB freed)"
+    
+    @property
+    def storage_used_mb(self):
+        return self._installed_apps.used_mb
+    
     def take_photo(self):
         """Take a photo"""
         if not self._powered_on:
@@ -157,27 +645,54 @@ class Smartphone:
         if self._battery_level < 2:
             return "❌ Cannot take photo - low battery"
         
-        self._photos.append(f"photo_{len(self._photos) + 1}.jpg")
+        self._photos.append("photo")
         self._use_battery(1)
-        return f"📸 Photo taken! Total: {len(self._photos)}"
+        return f"📸 Photo taken! Total: {self._photos.total}"
     
     def add_contact(self, name, number):
         """Add a contact"""
-        self._contacts[name] = number
+        self._contacts.add(name, number)
+        self._status = None
         return f"👤 Added contact: {name}"
     
+    def import_contacts(self, contacts):
+        """Import an address book of (name, number) pairs"""
+        added = self._contacts.import_contacts(contacts)
+        self._status = None
+        return f"👤 Imported {added} new contacts"
+    
+    def remove_contact(self, name):
+        """Remove a contact"""
+        if self._contacts.remove(name) is None:
+            return f"❌ No contact named {name}"
+        self._status = None
+        return f"👤 Removed contact: {name}"
+    
+    def caller_id(self, number):
+        """Look up who is calling from number"""
+        names = self._contacts.names_for(number)
+        return ", ".join(names) if names else number
+    
+    def search_contacts(self, prefix, limit=10):
+        """Autocomplete contact names starting with prefix"""
+        return self._contacts.search(prefix, limit)
+    
+    def status_snapshot(self):
+        """Get current device status as a DeviceStatus (cached until state changes)"""
+        if self._status is None:
+            self._status = DeviceStatus(
+                self._imei, self.full_name, self.specs, self._powered_on,
+                self._screen_locked, self._battery_level, self._current_call,
+                len(self._installed_apps), len(self._contacts), self._photos.total,
+            )
+        return self._status
+    
     def get_status(self):
         """Get current device status"""
-        status = f"\n{self.full_name} Status:\n"
-        status += f"Specs: {self.specs}\n"
-        status += f"Power: {'ON' if self._powered_on else 'OFF'}\n"
-        status += f"Screen: {'Locked' if self._screen_locked else 'Unlocked'}\n"
-        status += f"Battery: {self._battery_level}%\n"
-        status += f"In call: {self._current_call if self._current_call else 'No'}\n"
-        status += f"Apps: {len(self._installed_apps)} installed\n"
-        status += f"Contacts: {len(self._contacts)} saved\n"
-        status += f"Photos: {len(self._photos)} taken"
-        return status
+        status = self.status_snapshot()
+        if self._status_text is None or self._status_text[0] is not status:
+            self._status_text = (status, render_status(status))
+        return self._status_text[1]
     
     def perform_action(self):
         """Polymorphic method to be overridden by subclasses"""
@@ -217,15 +732,15 @@ class GamingPhone(Smartphone):
     def play_game(self, game_name):
         """Play a game"""
         if not self._powered_on:
-            return "❌ Cannot play game - device off"
+            return GAME_DEVICE_OFF
         
         battery_usage = 15 if self._game_mode else 10
         if self._battery_level < battery_usage:
-            return "❌ Cannot play game - low battery"
+            return GAME_LOW_BATTERY
         
         self._current_game = game_name
         self._use_battery(battery_usage)
-        return f"🎮 Playing {game_name} at {self._refresh_rate}Hz"
+        return Event((PLAYING, game_name, self._refresh_rate))
     
     def perform_action(self):
         """Override parent method - polymorphism"""
@@ -277,7 +792,7 @@ class CameraPhone(Smartphone):
             return "❌ Cannot take photo - low battery"
         
         flash_status = "with flash" if self._flash_enabled else "without flash"
-        self._photos.append(f"hq_photo_{len(self._photos) + 1}.jpg")
+        self._photos.append("hq_photo")
         self._use_battery(2)
         return f"📸 High-quality photo taken {flash_status} in {self._camera_mode} mode!"
     
@@ -286,13 +801,16 @@ class CameraPhone(Smartphone):
         return f"📸 Camera ready: {self.camera_specs}"
 
 
-def demonstrate_smartphones():
+def demonstrate_smartphones(out=None):
     """
     Function to demonstrate smartphone functionality and OOP concepts
     """
-    print("=" * 60)
-    print("SMARTPHONE CLASS DEMONSTRATION")
-    print("=" * 60)
+    if out is None:
+        with Output() as out:
+            return demonstrate_smartphones(out=out)
+    out.line("=" * 60)
+    out.line("SMARTPHONE CLASS DEMONSTRATION")
+    out.line("=" * 60)
     
     # Create different smartphone instances with unique values
     phone1 = Smartphone("Samsung", "Galaxy S23", "SAM123456789", 256, 8, "Android 14")
@@ -301,72 +819,73 @@ def demonstrate_smartphones():
     
     smartphones = [phone1, phone2, phone3]
     
-    print(f"\nTotal devices created: {Smartphone.device_count}")
-    print("\n" + "=" * 40)
+    out.line("\nTotal devices created: {}", Smartphone.device_count)
+    out.line("\n" + "=" * 40)
     
     # Demonstrate polymorphism
-    print("\nPOLYMORPHISM DEMONSTRATION:")
-    print("-" * 30)
+    out.line("\nPOLYMORPHISM DEMONSTRATION:")
+    out.line("-" * 30)
     for phone in smartphones:
-        action = phone.perform_action()
-        print(f"{phone.full_name}: {action}")
+        out.event(phone.perform_action(), label=phone.full_name)
     
-    print("\n" + "=" * 40)
+    out.line("\n" + "=" * 40)
     
     # Demonstrate each smartphone's unique features
-    print("\nUNIQUE FEATURES DEMONSTRATION:")
-    print("-" * 35)
+    out.line("\nUNIQUE FEATURES DEMONSTRATION:")
+    out.line("-" * 35)
     
     # Regular smartphone
-    print(f"\n{phone1.full_name}:")
-    print(phone1.power_on())
-    print(phone1.unlock())
-    print(phone1.install_app("WhatsApp"))
-    print(phone1.make_call("555-0123"))
-    print(phone1.send_message("555-0123", "Hello!"))
-    print(phone1.take_photo())
+    out.line("\n{}:", phone1.full_name)
+    out.event(phone1.power_on())
+    out.event(phone1.unlock())
+    out.event(phone1.install_app("WhatsApp"))
+    out.event(phone1.make_call("555-0123"))
+    out.event(phone1.send_message("555-0123", "Hello!"))
+    out.event(phone1.take_photo())
     
     # Gaming phone
-    print(f"\n{phone2.full_name}:")
-    print(phone2.power_on())
-    print(phone2.enable_game_mode())
-    print(phone2.play_game("Call of Duty Mobile"))
-    print(phone2.install_app("Game Launcher", 500))
+    out.line("\n{}:", phone2.full_name)
+    out.event(phone2.power_on())
+    out.event(phone2.enable_game_mode())
+    out.event(phone2.play_game("Call of Duty Mobile"))
+    out.event(phone2.install_app("Game Launcher", 500))
     
     # Camera phone
-    print(f"\n{phone3.full_name}:")
-    print(phone3.power_on())
-    print(phone3.enable_flash())
-    print(phone3.set_camera_mode("Portrait"))
-    print(phone3.take_photo())
-    print(phone3.take_photo())
+    out.line("\n{}:", phone3.full_name)
+    out.event(phone3.power_on())
+    out.event(phone3.enable_flash())
+    out.event(phone3.set_camera_mode("Portrait"))
+    out.event(phone3.take_photo())
+    out.event(phone3.take_photo())
     
-    print("\n" + "=" * 40)
+    out.line("\n" + "=" * 40)
     
     # Show status of all devices
-    print("\nDEVICE STATUS SUMMARY:")
-    print("-" * 25)
+    out.line("\nDEVICE STATUS SUMMARY:")
+    out.line("-" * 25)
     for phone in smartphones:
-        print(phone.get_status())
-        print("-" * 30)
+        out.event(phone.get_status())
+        out.line("-" * 30)
     
     # Demonstrate battery usage and charging
-    print("\nBATTERY MANAGEMENT:")
-    print("-" * 20)
+    out.line("\nBATTERY MANAGEMENT:")
+    out.line("-" * 20)
     for phone in smartphones:
-        print(f"{phone.full_name}: {phone.battery_level}%")
+        out.line("{}: {}%", phone.full_name, phone.battery_level)
         if phone.battery_level < 50:
-            print(phone.charge(30))
+            out.event(phone.charge(30))
     
-    print("\n" + "=" * 40)
+    out.line("\n" + "=" * 40)
     
     # Power off all devices
-    print("\nPOWERING OFF DEVICES:")
-    print("-" * 22)
+    out.line("\nPOWERING OFF DEVICES:")
+    out.line("-" * 22)
     for phone in smartphones:
-        print(phone.power_off())
+        out.event(phone.power_off())
+    out.flush()
 
 
 # Main execution
 if __name__ == "__main__":
-    demonstrate_smartphones()
\ No newline at end of file
+    with output_from_args() as out:
+        demonstrate_smartphones(out)
\ No newline at end of file
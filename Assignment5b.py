@@ -3,6 +3,44 @@ Vehicle Movement Simulator
 Demonstrating polymorphism with different move() implementations for various vehicles
 """
 
+from demo_output import Event, EventType, Output, output_from_args
+from instrumentation import profiled
+from vehicle_fsm import ACTION_IDS, machine_for
+
+# Results returned by move(); messages are formatted only when displayed
+_MOVING = ("brand", "model", "speed")
+_FLYING = ("brand", "model", "altitude", "speed")
+CAR_DRIVING = EventType("move", "🚗 {brand} {model} is driving on the road at {speed}km/h!", _MOVING)
+CAR_STOPPED = Event((EventType("move", "❌ Car cannot move - start the engine first!", ok=False),))
+MOTORCYCLE_RIDING = EventType("move", "🏍️ {brand} {model} is riding on the road at {speed}km/h!", _MOVING)
+MOTORCYCLE_STOPPED = Event((EventType("move", "❌ Motorcycle cannot move - start the engine first!", ok=False),))
+AIRPLANE_FLYING = EventType("move", "✈️ {brand} {model} is flying at {altitude} feet, speed: {speed}km/h!", _FLYING)
+AIRPLANE_TAXIING = EventType("move", "✈️ {brand} {model} is taxiing on runway at {speed}km/h!", _MOVING)
+AIRPLANE_STOPPED = Event((EventType("move", "❌ Airplane cannot move - start the engine first!", ok=False),))
+BOAT_SAILING = EventType("move", "🚢 {brand} {model} is sailing on water at {speed} knots!", _MOVING)
+BOAT_ANCHORED = Event((EventType("move", "⚠️ Boat cannot move - raise the anchor first!", ok=False),))
+BOAT_STOPPED = Event((EventType("move", "❌ Boat cannot move - start the engine first!", ok=False),))
+BICYCLE_PEDALING = EventType("move", "🚴 {brand} {model} is pedaling on the road at {speed}km/h!", _MOVING)
+BICYCLE_STOPPED = Event((EventType("move", "🚴 Bicycle is stationary - start pedaling!", ok=False),))
+HELICOPTER_FLYING = EventType("move", "🚁 {brand} {model} is flying at {altitude} feet, speed: {speed}km/h!", _FLYING)
+HELICOPTER_READY = EventType("move", "🚁 {brand} {model} is ready for takeoff on helipad!", _MOVING)
+HELICOPTER_STOPPED = Event((EventType("move", "❌ Helicopter cannot move - start the rotors first!", ok=False),))
+
+# Action ids into the compiled state machines (see vehicle_fsm)
+_START_ENGINE = ACTION_IDS["start_engine"]
+_STOP_ENGINE = ACTION_IDS["stop_engine"]
+_ACCELERATE = ACTION_IDS["accelerate"]
+_BRAKE = ACTION_IDS["brake"]
+_MOVE = ACTION_IDS["move"]
+_DO_WHEELIE = ACTION_IDS["do_wheelie"]
+_TAKE_OFF = ACTION_IDS["take_off"]
+_LAND = ACTION_IDS["land"]
+_INCREASE_ALTITUDE = ACTION_IDS["increase_altitude"]
+_HOVER = ACTION_IDS["hover"]
+_RAISE_ANCHOR = ACTION_IDS["raise_anchor"]
+_DROP_ANCHOR = ACTION_IDS["drop_anchor"]
+
+@profiled("accelerate", "move", "get_status")
 class Vehicle:
     """Base class for all vehicles"""
     
@@ -13,6 +51,11 @@ class Vehicle:
         self.fuel_type = fuel_type
         self.speed = 0
         self.engine_on = False
+        self.state = self._machine.initial       # transition rules live in vehicle_fsm
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls._machine = machine_for(cls)
     
     def move(self):
         """Base move method to be overridden by subclasses"""
@@ -20,30 +63,25 @@ class Vehicle:
     
     def start_engine(self):
         """Start the vehicle's engine"""
-        if not self.engine_on:
-            self.engine_on = True
+        if self._machine.fire(self, _START_ENGINE):
             return f"🔑 {self.brand} {self.model} engine started!"
         return "⚠️ Engine is already running!"
     
     def stop_engine(self):
         """Stop the vehicle's engine"""
-        if self.engine_on:
-            self.engine_on = False
-            self.speed = 0
+        if self._machine.fire(self, _STOP_ENGINE):
             return f"🔑 {self.brand} {self.model} engine stopped!"
         return "⚠️ Engine is already off!"
     
     def accelerate(self, amount):
         """Increase vehicle speed"""
-        if self.engine_on:
-            self.speed += amount
+        if self._machine.fire(self, _ACCELERATE, amount):
             return f"🚀 Accelerating to {self.speed} km/h!"
         return "❌ Cannot accelerate - engine is off!"
     
     def brake(self, amount):
         """Decrease vehicle speed"""
-        if self.speed > 0:
-            self.speed = max(0, self.speed - amount)
+        if self._machine.fire(self, _BRAKE, amount):
             return f"🛑 Braking to {self.speed} km/h!"
         return "⚠️ Vehicle is already stopped!"
     
@@ -59,6 +97,8 @@ class Vehicle:
     def __str__(self):
         return f"{self.brand} {self.model} ({self.vehicle_type})"
 
+Vehicle._machine = machine_for(Vehicle)
+
 class Car(Vehicle):
     """Car class - moves by driving on roads"""
     
@@ -69,8 +109,8 @@ class Car(Vehicle):
     
     def move(self):
         if self.engine_on:
-            return f"🚗 {self.brand} {self.model} is driving on the road at {self.speed}km/h!"
-        return "❌ Car cannot move - start the engine first!"
+            return Event((CAR_DRIVING, self.brand, self.model, self.speed))
+        return CAR_STOPPED
     
     def honk(self):
         return "🚨 Honk! Honk!"
@@ -91,11 +131,11 @@ class Motorcycle(Vehicle):
     
     def move(self):
         if self.engine_on:
-            return f"🏍️ {self.brand} {self.model} is riding on the road at {self.speed}km/h!"
-        return "❌ Motorcycle cannot move - start the engine first!"
+            return Event((MOTORCYCLE_RIDING, self.brand, self.model, self.speed))
+        return MOTORCYCLE_STOPPED
     
     def do_wheelie(self):
-        if self.speed > 30:
+        if self._machine.fire(self, _DO_WHEELIE):
             return "🎯 Performing an awesome wheelie! 🤘"
         return "❌ Too slow for a wheelie! Need more speed!"
     
@@ -116,27 +156,23 @@ class Airplane(Vehicle):
     
     def move(self):
         if self.engine_on and self.altitude > 0:
-            return f"✈️ {self.brand} {self.model} is flying at {self.altitude} feet, speed: {self.speed}km/h!"
+            return Event((AIRPLANE_FLYING, self.brand, self.model, self.altitude, self.speed))
         elif self.engine_on:
-            return f"✈️ {self.brand} {self.model} is taxiing on runway at {self.speed}km/h!"
-        return "❌ Airplane cannot move - start the engine first!"
+            return Event((AIRPLANE_TAXIING, self.brand, self.model, self.speed))
+        return AIRPLANE_STOPPED
     
     def take_off(self):
-        if self.engine_on and self.speed > 200:
-            self.altitude = 1000
+        if self._machine.fire(self, _TAKE_OFF):
             return "🛫 Airplane taking off! Climbing to 1000 feet!"
         return "❌ Not enough speed for takeoff! Need to accelerate more!"
     
     def land(self):
-        if self.altitude > 0:
-            self.altitude = 0
-            self.speed = 50
+        if self._machine.fire(self, _LAND):
             return "🛬 Airplane landing! Descending to runway!"
         return "⚠️ Airplane is already on ground!"
     
     def increase_altitude(self, feet):
-        if self.engine_on and self.altitude > 0:
-            self.altitude = min(self.max_altitude, self.altitude + feet)
+        if self._machine.fire(self, _INCREASE_ALTITUDE, feet):
             return f"📈 Climbing to {self.altitude} feet!"
         return "❌ Must be airborne to change altitude!"
     
@@ -152,22 +188,19 @@ class Boat(Vehicle):
         self.anchor_down = True
     
     def move(self):
-        if self.engine_on and not self.anchor_down:
-            return f"🚢 {self.brand} {self.model} is sailing on water at {self.speed} knots!"
+        if self._machine.allows(self, _MOVE) >= 0:
+            return Event((BOAT_SAILING, self.brand, self.model, self.speed))
         elif self.engine_on:
-            return "⚠️ Boat cannot move - raise the anchor first!"
-        return "❌ Boat cannot move - start the engine first!"
+            return BOAT_ANCHORED
+        return BOAT_STOPPED
     
     def raise_anchor(self):
-        if self.anchor_down:
-            self.anchor_down = False
+        if self._machine.fire(self, _RAISE_ANCHOR):
             return "⚓ Anchor raised! Ready to sail!"
         return "⚠️ Anchor is already raised!"
     
     def drop_anchor(self):
-        if not self.anchor_down:
-            self.anchor_down = True
-            self.speed = 0
+        if self._machine.fire(self, _DROP_ANCHOR):
             return "⚓ Anchor dropped! Boat secured!"
         return "⚠️ Anchor is already down!"
     
@@ -189,8 +222,8 @@ class Bicycle(Vehicle):
     
     def move(self):
         if self.speed > 0:
-            return f"🚴 {self.brand} {self.model} is pedaling on the road at {self.speed}km/h!"
-        return "🚴 Bicycle is stationary - start pedaling!"
+            return Event((BICYCLE_PEDALING, self.brand, self.model, self.speed))
+        return BICYCLE_STOPPED
     
     def start_engine(self):
         return "✅ Bicycle is ready to pedal! No engine needed!"
@@ -220,46 +253,134 @@ class Helicopter(Vehicle):
     
     def move(self):
         if self.rotor_spinning and self.altitude > 0:
-            return f"🚁 {self.brand} {self.model} is flying at {self.altitude} feet, speed: {self.speed}km/h!"
+            return Event((HELICOPTER_FLYING, self.brand, self.model, self.altitude, self.speed))
         elif self.rotor_spinning:
-            return f"🚁 {self.brand} {self.model} is ready for takeoff on helipad!"
-        return "❌ Helicopter cannot move - start the rotors first!"
+            return Event((HELICOPTER_READY, self.brand, self.model, self.speed))
+        return HELICOPTER_STOPPED
     
     def start_engine(self):
-        self.engine_on = True
-        self.rotor_spinning = True
+        self._machine.fire(self, _START_ENGINE)
         return f"🔑 {self.brand} {self.model} engine started! Rotors spinning! 🚁"
     
     def stop_engine(self):
-        self.engine_on = False
-        self.rotor_spinning = False
-        self.altitude = 0
-        self.speed = 0
+        self._machine.fire(self, _STOP_ENGINE)
         return f"🔑 {self.brand} {self.model} engine stopped! Rotors stopped! 🚁"
     
     def take_off(self):
-        if self.rotor_spinning:
-            self.altitude = 500
+        if self._machine.fire(self, _TAKE_OFF):
             return "🛫 Helicopter taking off! Hovering at 500 feet!"
         return "❌ Rotors not spinning! Start engine first!"
     
     def hover(self):
-        if self.altitude > 0:
-            self.speed = 0
+        if self._machine.fire(self, _HOVER):
             return "🚁 Hovering in place! Maintaining altitude!"
         return "❌ Must be airborne to hover!"
     
     def get_specs(self):
         return f"Helicopter specs: Rotor diameter {self.rotor_diameter}m, Fuel: {self.fuel_type}"
 
-def demonstrate_vehicle_movement():
+class ActionRegistry:
+    """
+    Maps vehicle classes to scripted action handlers.
+    Handlers take a vehicle and return a list of result messages. The
+    handler for each concrete class is resolved once through its MRO and
+    cached, so running a scenario costs one dict lookup per vehicle.
+    """
+    
+    def __init__(self):
+        self._handlers = {}
+        self._cache = {}
+    
+    def register(self, vehicle_class):
+        """Decorator registering a handler for vehicle_class and its subclasses"""
+        def decorator(handler):
+            self._handlers[vehicle_class] = handler
+            self._cache.clear()
+            return handler
+        return decorator
+    
+    def lookup(self, vehicle_class):
+        """Handler for vehicle_class (cached per concrete class)"""
+        handler = self._cache.get(vehicle_class)
+        if handler is None:
+            handler = next((self._handlers[cls] for cls in vehicle_class.__mro__
+                            if cls in self._handlers), _no_actions)
+            self._cache[vehicle_class] = handler
+        return handler
+    
+    def run(self, vehicle):
+        """Run the scripted actions for one vehicle"""
+        return self.lookup(type(vehicle))(vehicle)
+    
+    def run_all(self, vehicles):
+        """Generic scenario driver: action results for each vehicle, in order"""
+        cache = self._cache
+        results = []
+        for vehicle in vehicles:
+            handler = cache.get(type(vehicle)) or self.lookup(type(vehicle))
+            results.append(handler(vehicle))
+        return results
+
+def _no_actions(vehicle):
+    return []
+
+# Scripted actions for demonstrate_vehicle_movement()
+DEMO_ACTIONS = ActionRegistry()
+
+@DEMO_ACTIONS.register(Car)
+def _demo_car(vehicle):
+    return [vehicle.accelerate(60), vehicle.honk()]
+
+@DEMO_ACTIONS.register(Motorcycle)
+def _demo_motorcycle(vehicle):
+    return [vehicle.accelerate(80), vehicle.ring_bell()]
+
+@DEMO_ACTIONS.register(Airplane)
+def _demo_airplane(vehicle):
+    return [vehicle.accelerate(250), vehicle.take_off(), vehicle.increase_altitude(5000)]
+
+@DEMO_ACTIONS.register(Boat)
+def _demo_boat(vehicle):
+    return [vehicle.raise_anchor(), vehicle.accelerate(30), vehicle.blow_horn()]
+
+@DEMO_ACTIONS.register(Bicycle)
+def _demo_bicycle(vehicle):
+    return [vehicle.accelerate(20), vehicle.change_gear(5), vehicle.ring_bell()]
+
+@DEMO_ACTIONS.register(Helicopter)
+def _demo_helicopter(vehicle):
+    return [vehicle.take_off(), vehicle.accelerate(100), vehicle.hover()]
+
+# Scripted actions for vehicle_race_challenge()
+RACE_ACTIONS = ActionRegistry()
+
+@RACE_ACTIONS.register(Car)
+def _race_car(vehicle):
+    return [vehicle.accelerate(200)]
+
+@RACE_ACTIONS.register(Motorcycle)
+def _race_motorcycle(vehicle):
+    return [vehicle.accelerate(180), vehicle.do_wheelie()]
+
+@RACE_ACTIONS.register(Airplane)
+def _race_airplane(vehicle):
+    return [vehicle.accelerate(300), vehicle.take_off()]
+
+@RACE_ACTIONS.register(Boat)
+def _race_boat(vehicle):
+    return [vehicle.raise_anchor(), vehicle.accelerate(80)]
+
+def demonstrate_vehicle_movement(out=None):
     """
     Function to demonstrate polymorphism with vehicle move() method
     """
-    print("=" * 60)
-    print("VEHICLE MOVEMENT SIMULATOR")
-    print("=" * 60)
-    print("Demonstrating Polymorphism with move() method\n")
+    if out is None:
+        with Output() as out:
+            return demonstrate_vehicle_movement(out=out)
+    out.line("=" * 60)
+    out.line("VEHICLE MOVEMENT SIMULATOR")
+    out.line("=" * 60)
+    out.line("Demonstrating Polymorphism with move() method\n")
     
     # Create various vehicles
     vehicles = [
@@ -272,79 +393,61 @@ def demonstrate_vehicle_movement():
     ]
     
     # Demonstrate each vehicle's movement
-    print("🚗 VEHICLES IN ACTION 🚗")
-    print("-" * 30)
+    out.line("🚗 VEHICLES IN ACTION 🚗")
+    out.line("-" * 30)
     
     for vehicle in vehicles:
-        print(f"\n{vehicle}")
-        print(vehicle.start_engine())
+        out.line("\n{}", vehicle)
+        out.event(vehicle.start_engine())
         
         # Vehicle-specific actions
-        if isinstance(vehicle, Car):
-            print(vehicle.accelerate(60))
-            print(vehicle.honk())
-        
-        elif isinstance(vehicle, Motorcycle):
-            print(vehicle.accelerate(80))
-            print(vehicle.ring_bell())
-        
-        elif isinstance(vehicle, Airplane):
-            print(vehicle.accelerate(250))
-            print(vehicle.take_off())
-            print(vehicle.increase_altitude(5000))
-        
-        elif isinstance(vehicle, Boat):
-            print(vehicle.raise_anchor())
-            print(vehicle.accelerate(30))
-            print(vehicle.blow_horn())
-        
-        elif isinstance(vehicle, Bicycle):
-            print(vehicle.accelerate(20))
-            print(vehicle.change_gear(5))
-            print(vehicle.ring_bell())
-        
-        elif isinstance(vehicle, Helicopter):
-            print(vehicle.take_off())
-            print(vehicle.accelerate(100))
-            print(vehicle.hover())
+        for result in DEMO_ACTIONS.run(vehicle):
+            out.event(result)
         
         # Demonstrate polymorphism - same method, different behavior
-        print(f"Movement: {vehicle.move()}")
-        print(vehicle.get_status())
-        print(vehicle.get_specs())
-        print("-" * 40)
+        out.event(vehicle.move(), label="Movement")
+        out.event(vehicle.get_status())
+        out.event(vehicle.get_specs())
+        out.line("-" * 40)
     
-    print("=" * 60)
+    out.line("=" * 60)
     
     # Demonstrate polymorphism explicitly
-    print("🌟 POLYMORPHISM DEMONSTRATION 🌟")
-    print("-" * 35)
-    print("Calling move() on different vehicles without knowing their specific types:\n")
+    out.line("🌟 POLYMORPHISM DEMONSTRATION 🌟")
+    out.line("-" * 35)
+    out.line("Calling move() on different vehicles without knowing their specific types:\n")
     
     for vehicle in vehicles:
-        movement = vehicle.move()
-        print(f"{vehicle.__class__.__name__}: {movement}")
+        out.event(vehicle.move(), label=vehicle.__class__.__name__)
     
-    print("\n" + "=" * 60)
+    out.line("\n" + "=" * 60)
     
     # Stop all vehicles
-    print("🛑 STOPPING ALL VEHICLES 🛑")
-    print("-" * 25)
+    out.line("🛑 STOPPING ALL VEHICLES 🛑")
+    out.line("-" * 25)
     
     for vehicle in vehicles:
-        print(vehicle.stop_engine())
-        print(vehicle.get_status())
-        print()
+        out.event(vehicle.stop_engine())
+        out.event(vehicle.get_status())
+        out.line()
+    out.flush()
 
-def vehicle_race_challenge():
+def vehicle_race_challenge(out=None, seed=0, races=100, distance_km=5.0):
     """
-    Race challenge between different types of vehicles
+    Race challenge between different types of vehicles: one simulated race
+    with its finishing order, then the win share over a batch of races
     """
-    print("\n" + "=" * 60)
-    print("🏁 VEHICLE RACE CHALLENGE! 🏁")
-    print("=" * 60)
+    if out is None:
+        with Output() as out:
+            return vehicle_race_challenge(out=out, seed=seed, races=races, distance_km=distance_km)
+    # Imported here: race_engine imports the vehicle classes from this module
+    from race_engine import DID_NOT_FINISH, run_races, simulate_race
+
+    out.line("\n" + "=" * 60)
+    out.line("🏁 VEHICLE RACE CHALLENGE! 🏁")
+    out.line("=" * 60)
     
-    # Create racing vehicles
+    # Create racing vehicles (the same line-up as race_engine.RACE_ENTRANTS)
     race_vehicles = [
         Car("Ferrari", "488", "Gasoline", 2),
         Motorcycle("Ducati", "Panigale", "Gasoline", 1100),
@@ -352,37 +455,44 @@ def vehicle_race_challenge():
         Boat("Formula", "350", "Gasoline", "Racing Boat")
     ]
     
-    print("RACE PARTICIPANTS:")
+    out.line("RACE PARTICIPANTS:")
     for i, vehicle in enumerate(race_vehicles, 1):
-        print(f"{i}. {vehicle}")
+        out.line("{}. {}", i, vehicle)
     
-    print("\n🏁 RACE START! 🏁")
+    out.line("\n🏁 RACE START! 🏁")
     for vehicle in race_vehicles:
-        print(f"\n{vehicle}:")
-        print(vehicle.start_engine())
+        out.line("\n{}:", vehicle)
+        out.event(vehicle.start_engine())
         
-        if isinstance(vehicle, Car):
-            print(vehicle.accelerate(200))
-        elif isinstance(vehicle, Motorcycle):
-            print(vehicle.accelerate(180))
-            print(vehicle.do_wheelie())
-        elif isinstance(vehicle, Airplane):
-            print(vehicle.accelerate(300))
-            print(vehicle.take_off())
-        elif isinstance(vehicle, Boat):
-            print(vehicle.raise_anchor())
-            print(vehicle.accelerate(80))
+        for result in RACE_ACTIONS.run(vehicle):
+            out.event(result)
         
-        print(vehicle.move())
-    
-    print("\n🏆 And the winners are... 🏆")
-    print("Each vehicle excels in its own environment! 🎉")
+        out.event(vehicle.move())
+    
+    out.line("\n🏆 And the winners are... 🏆")
+    finish = simulate_race(seed, distance_km)
+    order = sorted(range(len(finish)), key=finish.__getitem__)
+    for place, i in enumerate(order, 1):
+        finish_time = "DNF" if finish[i] == DID_NOT_FINISH else f"{finish[i]:.1f}s"
+        out.line("{}. {} - {}", place, race_vehicles[i], finish_time)
+    if finish[order[0]] == DID_NOT_FINISH:
+        out.line("Nobody reached the {:g} km finish line!", distance_km)
+    else:
+        out.line("🎉 {} wins the {:g} km race!", race_vehicles[order[0]], distance_km)
+
+    if races > 0:
+        results = run_races(races, workers=1, seed=seed, distance_km=distance_km)
+        out.line("\n📊 Over {} races:", races)
+        for vehicle, share in zip(race_vehicles, results.win_distribution().values()):
+            out.line("{}: {:.0%} wins", vehicle, share)
+    out.flush()
 
 # Main execution
 if __name__ == "__main__":
-    demonstrate_vehicle_movement()
-    vehicle_race_challenge()
-    
-    print("\n" + "=" * 60)
-    print("THANK YOU FOR USING THE VEHICLE MOVEMENT SIMULATOR!")
-    print("=" * 60)
\ No newline at end of file
+    with output_from_args() as out:
+        demonstrate_vehicle_movement(out)
+        vehicle_race_challenge(out)
+        
+        out.line("\n" + "=" * 60)
+        out.line("THANK YOU FOR USING THE VEHICLE MOVEMENT SIMULATOR!")
+        out.line("=" * 60)
\ No newline at end of file
@@ -0,0 +1,433 @@
+"""
+Benchmarks for the data structures behind the assignment classes
+Run directly to time the hot paths and flag regressions against a stored
+baseline (--json, --baseline, --save-baseline); --suite components or all
+adds the throughput and memory figures (see --help)
+"""
+
+import argparse
+import datetime
+import json
+import os
+import pickle
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from Assignment3 import calculate_discount
+from Assignment4 import transform_content
+from Assignment5a import MessageLog, Smartphone
+from Assignment5b import (Car, Motorcycle, Airplane, Boat, Bicycle, Helicopter,
+                          DEMO_ACTIONS)
+from Calculator import calculate
+from multi_task_program import common_integers, parse_integers
+from fleet_snapshot import Snapshot, load_simulation, save_simulation
+from smartphone_simulator import EventScheduler, build_fleet, generate_workload
+from spatial_index import SpatialIndex, brute_force_within
+from vehicle_simulation import random_traffic, random_vehicle, ticks_per_second
+
+
+def _measure(build, n):
+    """
+    Return (seconds, bytes allocated and still held) for build(n). The two
+    come from separate runs, since tracemalloc slows every allocation and
+    would distort the timing.
+    """
+    start = time.perf_counter()
+    result = build(n)
+    elapsed = time.perf_counter() - start
+    del result
+    tracemalloc.start()
+    result = build(n)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return elapsed, current
+
+
+def _fill_message_list(n):
+    """Baseline: one dict per message, as Smartphone used to store them"""
+    messages = []
+    for i in range(n):
+        messages.append({"to": f"555-{i % 1000:04d}", "message": "Hello!"})
+    return messages
+
+
+def _fill_message_log(n):
+    log = MessageLog()
+    for i in range(n):
+        log.append(f"555-{i % 1000:04d}", "Hello!", timestamp=float(i))
+    return log
+
+
+def bench_message_store(n=200_000):
+    """Compare messages/second and bytes/message for list-of-dicts vs MessageLog"""
+    print(f"\nMESSAGE STORE ({n:,} messages):")
+    print("-" * 40)
+    results = {}
+    for name, build in (("list of dicts", _fill_message_list),
+                        ("MessageLog", _fill_message_log)):
+        elapsed, held = _measure(build, n)
+        results[name] = (n / elapsed, held / n)
+        print(f"{name:15s} {n / elapsed:12,.0f} msg/s {held / n:8.1f} bytes/msg")
+    return results
+
+
+def bench_event_scheduler(devices=2000, events_per_device=100, seed=0):
+    """Events per second through the discrete-event smartphone simulator"""
+    print(f"\nEVENT SCHEDULER ({devices:,} devices x {events_per_device} events):")
+    print("-" * 40)
+    scheduler = EventScheduler(build_fleet(devices, seed))
+    generate_workload(scheduler, events_per_device, seed=seed)
+    scheduler.run()
+    rates = scheduler.throughput()
+    print(f"{rates['total']:12,.0f} events/s ({rates['total'] * 60:,.0f} per minute)")
+    return rates
+
+
+def bench_traffic_ticks(sizes=(10_000, 100_000), ticks=5):
+    """Ticks per second of the vehicle traffic simulation at several fleet sizes"""
+    print("\nTRAFFIC SIMULATION:")
+    print("-" * 40)
+    results = {}
+    for size in sizes:
+        rate = ticks_per_second(random_traffic(size), ticks)
+        results[size] = rate
+        print(f"{size:10,d} vehicles {rate:10.2f} ticks/s")
+    return results
+
+
+def _run_isinstance_chain(vehicles):
+    """Baseline: the if/elif isinstance chain the demos used before the registry"""
+    handlers = [DEMO_ACTIONS.lookup(cls)
+                for cls in (Car, Motorcycle, Airplane, Boat, Bicycle, Helicopter)]
+    results = []
+    for vehicle in vehicles:
+        if isinstance(vehicle, Car):
+            results.append(handlers[0](vehicle))
+        elif isinstance(vehicle, Motorcycle):
+            results.append(handlers[1](vehicle))
+        elif isinstance(vehicle, Airplane):
+            results.append(handlers[2](vehicle))
+        elif isinstance(vehicle, Boat):
+            results.append(handlers[3](vehicle))
+        elif isinstance(vehicle, Bicycle):
+            results.append(handlers[4](vehicle))
+        elif isinstance(vehicle, Helicopter):
+            results.append(handlers[5](vehicle))
+    return results
+
+
+def bench_action_dispatch(n=1_000_000, seed=0):
+    """Scripted-action dispatch: isinstance chain vs ActionRegistry"""
+    print(f"\nACTION DISPATCH ({n:,} mixed vehicles):")
+    print("-" * 40)
+    results = {}
+    for name, run in (("isinstance chain", _run_isinstance_chain),
+                      ("ActionRegistry", DEMO_ACTIONS.run_all)):
+        # The actions change vehicle state, so each contender gets its own
+        # fleet built from the same seed
+        rng = random.Random(seed)
+        vehicles = [random_vehicle(rng, serial) for serial in range(n)]
+        start = time.perf_counter()
+        run(vehicles)
+        elapsed = time.perf_counter() - start
+        results[name] = n / elapsed
+        print(f"{name:18s} {n / elapsed:12,.0f} vehicles/s")
+    return results
+
+
+def bench_spatial_index(sizes=(10_000, 100_000, 1_000_000), queries=20, radius=2.0, seed=0):
+    """
+    Radius queries: grid SpatialIndex vs a linear scan, at constant density
+    (one vehicle per km^2, air vehicles up to ~3km). The all-pairs column
+    extrapolates the scan to one query per vehicle.
+    """
+    print(f"\nSPATIAL INDEX (radius {radius}km, {queries} queries):")
+    print("-" * 40)
+    results = {}
+    for size in sizes:
+        rng = random.Random(seed)
+        side = size ** 0.5
+        points = [(rng.uniform(0, side), rng.uniform(0, side),
+                   rng.choice((0.0, rng.uniform(0, 3)))) for _ in range(size)]
+        start = time.perf_counter()
+        index = SpatialIndex(cell_size=radius)
+        for item, (x, y, z) in enumerate(points):
+            index.insert(item, x, y, z)
+        build = time.perf_counter() - start
+        targets = rng.sample(points, queries)
+
+        start = time.perf_counter()
+        for x, y, z in targets:
+            index.within(x, y, z, radius)
+        grid = (time.perf_counter() - start) / queries
+
+        start = time.perf_counter()
+        for x, y, z in targets:
+            brute_force_within(points, x, y, z, radius)
+        scan = (time.perf_counter() - start) / queries
+
+        results[size] = {"build_s": build, "grid_query_s": grid, "scan_query_s": scan}
+        print(f"{size:10,d} vehicles  build {build:6.2f}s  grid {grid * 1e6:10,.0f}us/query  "
+              f"scan {scan * 1e6:12,.0f}us/query  all-pairs ~{scan * size:10,.0f}s "
+              f"vs ~{grid * size:8,.1f}s")
+    return results
+
+
+def _timed(function, *args):
+    start = time.perf_counter()
+    result = function(*args)
+    return time.perf_counter() - start, result
+
+
+def bench_snapshot(sizes=(100_000, 1_000_000)):
+    """Checkpoint/restore of a TrafficSimulation: columnar snapshot vs pickle"""
+    print("\nSNAPSHOTS:")
+    print("-" * 40)
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        snapshot_path = os.path.join(directory, "fleet.snap")
+        pickle_path = os.path.join(directory, "fleet.pickle")
+        for size in sizes:
+            simulation = random_traffic(size)
+            save, _ = _timed(save_simulation, simulation, snapshot_path)
+            with Snapshot(snapshot_path) as snapshot:
+                columns, _ = _timed(lambda: [snapshot.column("sim." + name)
+                                             for name in ("x", "y", "speed", "altitude")])
+            restore, _ = _timed(load_simulation, snapshot_path)
+
+            def dump():
+                with open(pickle_path, "wb") as file:
+                    pickle.dump(simulation, file, protocol=pickle.HIGHEST_PROTOCOL)
+
+            def load():
+                with open(pickle_path, "rb") as file:
+                    return pickle.load(file)
+
+            pickle_save, _ = _timed(dump)
+            pickle_restore, _ = _timed(load)
+            results[size] = {
+                "snapshot_save_s": save, "snapshot_columns_s": columns,
+                "snapshot_restore_s": restore, "snapshot_bytes": os.path.getsize(snapshot_path),
+                "pickle_save_s": pickle_save, "pickle_restore_s": pickle_restore,
+                "pickle_bytes": os.path.getsize(pickle_path),
+            }
+            print(f"{size:10,d} vehicles  snapshot save {save:6.2f}s  zero-copy columns "
+                  f"{columns * 1000:6.2f}ms  full restore {restore:6.2f}s  "
+                  f"{os.path.getsize(snapshot_path) / size:6.1f} B/vehicle")
+            print(f"{'':19s} pickle   save {pickle_save:6.2f}s  {'':26s}restore "
+                  f"{pickle_restore:6.2f}s  {os.path.getsize(pickle_path) / size:6.1f} B/vehicle")
+    return results
+
+
+# Hot paths timed by the regression harness. Each setup builds its input
+# for size n outside the timed region and returns a zero-argument callable.
+
+def _transform_setup(n):
+    content = "\n".join(f"line {i} of the sample file" for i in range(n))
+    return lambda: transform_content(content)
+
+
+def _parse_sum_setup(n):
+    text = " ".join(str(i) for i in range(n))
+    return lambda: sum(parse_integers(text))
+
+
+def _intersection_setup(n):
+    first = " ".join(str(i) for i in range(0, 2 * n, 2))
+    second = " ".join(str(i) for i in range(0, 3 * n, 3))
+    return lambda: common_integers(first, second)
+
+
+def _discount_setup(n):
+    prices = [(float(i), i % 40) for i in range(n)]
+    return lambda: [calculate_discount(price, percent) for price, percent in prices]
+
+
+def _calculator_setup(n):
+    operations = [(float(i), float(i % 7), "+-*/"[i % 4]) for i in range(n)]
+    return lambda: [calculate(a, b, operation) for a, b, operation in operations]
+
+
+def _phone_churn_setup(n):
+    def churn():
+        phone = Smartphone("Samsung", "Galaxy S23", "BENCH0001", 256, 8, "Android 14")
+        phone.power_on()
+        phone.unlock()
+        for i in range(n):
+            app = f"App{i % 50}"
+            phone.install_app(app, 10)
+            phone.send_message("555-0100", "Hello!")
+            phone.make_call("555-0100")
+            phone.end_call()
+            phone.get_status()
+            phone.uninstall_app(app)
+            phone.charge(10)
+    return churn
+
+
+def _vehicle_setup(n):
+    rng = random.Random(0)
+    vehicles = [random_vehicle(rng, serial) for serial in range(n)]
+
+    def drive():
+        for vehicle in vehicles:
+            vehicle.accelerate(10)
+            vehicle.move()
+            vehicle.brake(10)
+    return drive
+
+
+HOT_PATHS = {
+    "assignment4.transform_content": (_transform_setup, (1_000, 10_000, 100_000)),
+    "multi_task.parse_sum": (_parse_sum_setup, (1_000, 10_000, 100_000)),
+    "multi_task.set_intersection": (_intersection_setup, (1_000, 10_000, 100_000)),
+    "assignment3.calculate_discount": (_discount_setup, (1_000, 10_000, 100_000)),
+    "calculator.calculate": (_calculator_setup, (1_000, 10_000, 100_000)),
+    "smartphone.churn": (_phone_churn_setup, (100, 1_000, 10_000)),
+    "vehicle.accelerate_move": (_vehicle_setup, (1_000, 10_000, 100_000)),
+}
+
+
+def bench_hot_paths(repeat=5, names=None):
+    """
+    Time every hot path at each of its sizes, repeat times. The best run is
+    what baselines are compared on; the median is kept to show noise.
+    """
+    print(f"\nHOT PATHS (best of {repeat}):")
+    print("-" * 40)
+    results = {}
+    for name, (setup, sizes) in HOT_PATHS.items():
+        if names and name not in names:
+            continue
+        results[name] = {}
+        for size in sizes:
+            run = setup(size)
+            timings = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                run()
+                timings.append(time.perf_counter() - start)
+            best = min(timings)
+            results[name][str(size)] = {
+                "best_s": best,
+                "median_s": statistics.median(timings),
+                "per_item_ns": best / size * 1e9,
+            }
+            print(f"{name:32s} {size:8,d}  {best * 1000:10.3f}ms  "
+                  f"{best / size * 1e9:10.1f}ns/item")
+    return results
+
+
+def _git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)),
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def environment():
+    """Metadata stored with every result file so runs can be told apart"""
+    return {
+        "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+        "git_commit": _git_commit(),
+    }
+
+
+def compare(results, baseline, threshold=0.10):
+    """
+    Compare hot-path results with a baseline report. Returns one row per
+    (name, size) present in both whose best time grew by more than threshold
+    (a fraction, 0.10 = 10% slower).
+    """
+    regressions = []
+    previous = baseline.get("hot_paths", {})
+    for name, sizes in results.items():
+        for size, row in sizes.items():
+            old = previous.get(name, {}).get(size)
+            if old is None:
+                continue
+            change = row["best_s"] / old["best_s"] - 1.0
+            if change > threshold:
+                regressions.append({"name": name, "size": int(size), "baseline_s": old["best_s"],
+                                    "current_s": row["best_s"], "change": change})
+    return regressions
+
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmark_baseline.json")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Throughput benchmarks and hot-path regression checks")
+    parser.add_argument("--suite", choices=("all", "hot", "components"), default="hot",
+                        help="hot paths only (default), the data-structure benchmarks only, or both")
+    parser.add_argument("--only", action="append", choices=list(HOT_PATHS), metavar="NAME",
+                        help="restrict the hot paths run (repeatable)")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per hot path and size")
+    parser.add_argument("--json", metavar="PATH", help="write results and environment as JSON")
+    parser.add_argument("--baseline", metavar="PATH", default=BASELINE_PATH,
+                        help="baseline report to compare against / save to")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="store this run as the new baseline instead of comparing")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="allowed slowdown before a hot path is a regression (0.10 = 10%%)")
+    args = parser.parse_args(argv)
+
+    print("=" * 60)
+    print("BENCHMARKS")
+    print("=" * 60)
+    if args.suite in ("all", "components"):
+        bench_message_store()
+        bench_event_scheduler()
+        bench_traffic_ticks()
+        bench_action_dispatch()
+        bench_spatial_index()
+        bench_snapshot()
+    if args.suite == "components":
+        return 0
+
+    report = {"environment": environment(), "repeat": args.repeat,
+              "hot_paths": bench_hot_paths(args.repeat, args.only)}
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2)
+    if args.save_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2)
+        print(f"\nBaseline saved to {args.baseline}")
+        return 0
+    if not os.path.exists(args.baseline):
+        print(f"\nNo baseline at {args.baseline}; run with --save-baseline to create one")
+        return 0
+
+    with open(args.baseline, encoding="utf-8") as file:
+        baseline = json.load(file)
+    regressions = compare(report["hot_paths"], baseline, args.threshold)
+    print(f"\nREGRESSIONS vs {args.baseline} (threshold {args.threshold:.0%}):")
+    print("-" * 40)
+    if baseline.get("environment", {}).get("machine") != report["environment"]["machine"]:
+        print("Note: baseline was recorded on a different machine")
+    for row in regressions:
+        print(f"{row['name']:32s} {row['size']:8,d}  {row['baseline_s'] * 1000:10.3f}ms -> "
+              f"{row['current_s'] * 1000:10.3f}ms  ({row['change']:+.0%})")
+    if not regressions:
+        print("None")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
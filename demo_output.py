@@ -0,0 +1,166 @@
+"""
+Shared Output Layer
+Buffered text, quiet and JSON-lines sinks for the demo drivers, plus the
+Event records returned by methods whose messages are formatted on demand
+"""
+
+import argparse
+import json
+import sys
+
+
+class EventType:
+    """
+    The fixed part of an action result: kind, message template, the names
+    of its fields and whether it reports success. Define these once at
+    module level so creating an Event only stores the field values.
+    """
+
+    __slots__ = ("kind", "template", "fields", "ok")
+
+    def __init__(self, kind, template, fields=(), ok=True):
+        self.kind = kind
+        self.template = template
+        self.fields = tuple(fields)
+        self.ok = ok
+
+    def __repr__(self):
+        return f"EventType({self.kind!r}, {self.template!r}, {self.fields!r}, ok={self.ok})"
+
+
+class Event(tuple):
+    """
+    Result of an action: a tuple of an EventType followed by the field
+    values in the order of type.fields, e.g.
+    Event((CALLING, number)). Building one is a single tuple allocation;
+    the human-readable text is only produced when str() is called, so
+    quiet and structured sinks never pay for formatting.
+    """
+
+    __slots__ = ()
+
+    @property
+    def type(self):
+        return self[0]
+
+    @property
+    def values(self):
+        return self[1:]
+
+    @property
+    def kind(self):
+        return self[0].kind
+
+    @property
+    def ok(self):
+        return self[0].ok
+
+    @property
+    def fields(self):
+        return dict(zip(self[0].fields, self[1:]))
+
+    def __str__(self):
+        if len(self) == 1:
+            return self[0].template
+        return self[0].template.format(**self.fields)
+
+    def __repr__(self):
+        return f"Event({self.kind!r}, ok={self.ok}, {self.fields!r})"
+
+    def as_dict(self):
+        """Structured form used by the JSON-lines sink; failures carry their text"""
+        data = {"event": self.kind, "ok": self.ok, **self.fields}
+        if not self.ok:
+            data["text"] = str(self)
+        return data
+
+
+def is_failure(result):
+    """Whether an action result (Event or message string) reports a failure"""
+    if isinstance(result, Event):
+        return not result.ok
+    return result.startswith("❌")
+
+
+MODES = ("text", "quiet", "jsonl")
+
+
+class Output:
+    """
+    Sink for demo output.
+      text  - human-readable lines, written in batches of buffer_size
+      quiet - nothing is formatted or written; events are only counted
+      jsonl - one JSON object per event/line
+    Use as a context manager (or call flush()) so the last batch is written.
+    Quiet mode only skips formatting for Event results and line() templates;
+    methods that still return plain f-strings (get_status, accelerate,
+    start_engine, ...) build their text before the sink sees it.
+    """
+
+    def __init__(self, mode="text", stream=None, buffer_size=256):
+        if mode not in MODES:
+            raise ValueError(f"Unknown output mode: {mode}")
+        self.mode = mode
+        self.stream = stream or sys.stdout
+        self.buffer_size = buffer_size
+        self.events = 0
+        self._buffer = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.flush()
+
+    @property
+    def quiet(self):
+        return self.mode == "quiet"
+
+    def _write(self, text):
+        self._buffer.append(text)
+        if len(self._buffer) >= self.buffer_size:
+            self.flush()
+
+    def line(self, template="", *args):
+        """A line of narration; template is only formatted if it will be shown"""
+        if self.mode == "quiet":
+            return
+        text = template.format(*args) if args else template
+        if self.mode == "text":
+            self._write(text)
+        else:
+            self._write(json.dumps({"text": text}, ensure_ascii=False))
+
+    def event(self, record, label=None):
+        """An action result (Event or plain message string), optionally labelled"""
+        self.events += 1
+        if self.mode == "quiet":
+            return
+        if self.mode == "text":
+            self._write(f"{label}: {record}" if label else str(record))
+            return
+        data = record.as_dict() if isinstance(record, Event) else {"text": record}
+        if label:
+            data["label"] = label
+        self._write(json.dumps(data, ensure_ascii=False))
+
+    def prompt(self, text):
+        """Flush pending output, then read a line from the user"""
+        self.flush()
+        return input(text)
+
+    def flush(self):
+        if self._buffer:
+            self.stream.write("\n".join(self._buffer) + "\n")
+            self._buffer.clear()
+        self.stream.flush()
+
+
+def output_from_args(argv=None):
+    """Build an Output from --quiet / --jsonl command-line flags"""
+    parser = argparse.ArgumentParser(add_help=False)
+    group = parser.add_mutually_exclusive_group()
+    group.add_argument("--quiet", action="store_const", dest="mode", const="quiet")
+    group.add_argument("--jsonl", action="store_const", dest="mode", const="jsonl")
+    args, _ = parser.parse_known_args(sys.argv[1:] if argv is None else argv)
+    return Output(args.mode or "text")
@@ -0,0 +1,476 @@
+"""
+Fleet Snapshots
+Compact, versioned, columnar binary checkpoints for Smartphone fleets,
+Vehicle fleets and TrafficSimulation state, loadable zero-copy via mmap
+
+File layout:
+    b"FLEETSNP" | header length (uint32) | JSON header | padding | segments
+Every column is stored as one or more 8-byte aligned segments. Numeric
+columns are raw native arrays; string columns are dictionary encoded as
+uint32 ids (NULL_ID for None) plus an offsets array and a UTF-8 blob.
+Numeric object columns that mix bool/int/float carry a "<column>#types"
+column of per-row type ids so values load back with their original type.
+"""
+
+import json
+import mmap
+import struct
+import sys
+from array import array
+from itertools import accumulate
+from operator import itemgetter
+
+from Assignment5a import Smartphone, GamingPhone, CameraPhone, AppRegistry, ContactBook, MessageLog, PhotoLog
+from Assignment5b import Car, Motorcycle, Airplane, Boat, Bicycle, Helicopter
+from vehicle_fsm import resync
+from vehicle_simulation import TrafficSimulation, MOTION_RULES, VEHICLE_TYPES
+
+MAGIC = b"FLEETSNP"
+SNAPSHOT_VERSION = 1
+NULL_ID = 0xFFFFFFFF
+
+PHONE_CLASSES = {cls.__name__: cls for cls in (Smartphone, GamingPhone, CameraPhone)}
+VEHICLE_CLASSES = {cls.__name__: cls for cls in (Car, Motorcycle, Airplane, Boat, Bicycle, Helicopter)}
+
+# Header upgrades: version -> function(header) returning the next version's header.
+# Add an entry here whenever SNAPSHOT_VERSION is bumped.
+UPGRADES = {}
+
+
+class SnapshotError(Exception):
+    """Raised for unreadable or incompatible snapshot files"""
+
+
+def _pad(length):
+    return -length % 8
+
+
+def _string_segments(values):
+    """Dictionary-encode a list of str/None into (ids, offsets, blob)"""
+    unique = [value for value in dict.fromkeys(values) if value is not None]
+    lookup = {value: i for i, value in enumerate(unique)}
+    lookup[None] = NULL_ID
+    ids = array('I', [lookup[value] for value in values])
+    encoded = [value.encode("utf-8") for value in unique]
+    offsets = array('Q', [0])
+    offsets.extend(accumulate(map(len, encoded)))
+    return ids, offsets, b"".join(encoded)
+
+
+def write_snapshot(path, kind, columns, meta=None):
+    """
+    Write columns to path.
+    columns maps name -> array (numeric) or list of str/None (string).
+    """
+    segments = []
+    directory = {}
+    position = 0
+
+    def add_segment(data):
+        nonlocal position
+        raw = data.tobytes() if isinstance(data, array) else data
+        segments.append(raw)
+        segments.append(bytes(_pad(len(raw))))
+        entry = [position, len(raw)]
+        position += len(raw) + _pad(len(raw))
+        return entry
+
+    for name, values in columns.items():
+        if isinstance(values, array):
+            directory[name] = {"type": values.typecode, "rows": len(values),
+                               "data": add_segment(values)}
+        else:
+            ids, offsets, blob = _string_segments(values)
+            directory[name] = {"type": "str", "rows": len(ids), "data": add_segment(ids),
+                               "offsets": add_segment(offsets), "blob": add_segment(blob)}
+
+    header = json.dumps({
+        "version": SNAPSHOT_VERSION,
+        "kind": kind,
+        "byteorder": sys.byteorder,
+        "meta": meta or {},
+        "columns": directory,
+    }).encode("utf-8")
+    prefix_length = len(MAGIC) + 4 + len(header)
+    with open(path, "wb") as file:
+        file.write(MAGIC)
+        file.write(struct.pack("<I", len(header)))
+        file.write(header)
+        file.write(bytes(_pad(prefix_length)))
+        for segment in segments:
+            file.write(segment)
+
+
+class StringColumn:
+    """Read-only view of a dictionary-encoded string column"""
+
+    def __init__(self, ids, offsets, blob):
+        self._ids = ids
+        self._offsets = offsets
+        self._blob = blob
+        self._strings = [None] * (len(offsets) - 1)
+
+    def __len__(self):
+        return len(self._ids)
+
+    def __getitem__(self, index):
+        string_id = self._ids[index]
+        if string_id == NULL_ID:
+            return None
+        value = self._strings[string_id]
+        if value is None:
+            value = bytes(self._blob[self._offsets[string_id]:self._offsets[string_id + 1]]).decode("utf-8")
+            self._strings[string_id] = value
+        return value
+
+    def __iter__(self):
+        return iter(self.to_list())
+
+    def to_list(self):
+        """Decode the whole column at once"""
+        blob = bytes(self._blob)
+        offsets = self._offsets
+        strings = [blob[offsets[i]:offsets[i + 1]].decode("utf-8") for i in range(len(offsets) - 1)]
+        strings.append(None)
+        null = len(strings) - 1
+        return [strings[null if string_id == NULL_ID else string_id] for string_id in self._ids]
+
+
+class Snapshot:
+    """
+    A memory-mapped snapshot file. Numeric columns are returned as
+    memoryviews over the mapping (no copy); string columns are decoded
+    lazily. Close the snapshot (or use it as a context manager) when the
+    columns are no longer needed.
+    """
+
+    def __init__(self, path):
+        self._file = open(path, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError as error:
+            self._file.close()
+            raise SnapshotError(f"Empty or unreadable snapshot: {path}") from error
+        self._view = memoryview(self._map)
+        if bytes(self._view[:len(MAGIC)]) != MAGIC:
+            self.close()
+            raise SnapshotError(f"Not a fleet snapshot: {path}")
+        try:
+            (header_length,) = struct.unpack_from("<I", self._map, len(MAGIC))
+            start = len(MAGIC) + 4
+            if start + header_length > len(self._map):
+                raise ValueError("header runs past the end of the file")
+            header = json.loads(bytes(self._view[start:start + header_length]))
+            version = header["version"]
+            if version > SNAPSHOT_VERSION:
+                raise SnapshotError(f"Snapshot version {version} is newer than supported ({SNAPSHOT_VERSION})")
+            while version < SNAPSHOT_VERSION:
+                header = UPGRADES[version](header)
+                version = header["version"]
+            if header["byteorder"] != sys.byteorder:
+                raise SnapshotError("Snapshot was written on a machine with a different byte order")
+            self.kind = header["kind"]
+            self.meta = header["meta"]
+            self._columns = header["columns"]
+        except SnapshotError:
+            self.close()
+            raise
+        except (struct.error, ValueError, KeyError, TypeError) as error:
+            self.close()
+            raise SnapshotError(f"Corrupt snapshot header in {path}: {error}") from error
+        data_start = start + header_length
+        self._base = data_start + _pad(data_start)
+        self._open_views = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __contains__(self, name):
+        return name in self._columns
+
+    def _segment(self, entry, typecode):
+        offset, length = entry
+        if self._base + offset + length > len(self._map):
+            raise SnapshotError("Snapshot is truncated: column data runs past the end of the file")
+        view = self._view[self._base + offset:self._base + offset + length].cast(typecode)
+        self._open_views.append(view)
+        return view
+
+    def column(self, name):
+        info = self._columns[name]
+        if info["type"] == "str":
+            return StringColumn(self._segment(info["data"], 'I'),
+                                self._segment(info["offsets"], 'Q'),
+                                self._segment(info["blob"], 'B'))
+        return self._segment(info["data"], info["type"])
+
+    def rows(self, name):
+        return self._columns[name]["rows"]
+
+    def close(self):
+        """Release every view handed out, then the mapping itself"""
+        for view in getattr(self, "_open_views", ()):
+            view.release()
+        if getattr(self, "_view", None) is not None:
+            self._view.release()
+            self._view = None
+        if getattr(self, "_map", None) is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
+
+
+# Per-row type ids for numeric columns that mix bool, int and float values
+NUMERIC_TYPES = (float, int, bool)
+NUMERIC_TYPE_IDS = {kind: i for i, kind in enumerate(NUMERIC_TYPES)}
+
+
+def _scalar_typecode(values):
+    """Column type for a list of attribute values, or None if not storable"""
+    kinds = set(map(type, values))
+    if kinds <= {bool}:
+        return 'B'
+    if kinds <= {bool, int}:
+        return 'q'
+    if kinds <= {bool, int, float}:
+        return 'd'
+    if kinds <= {str, type(None)}:
+        return "str"
+    return None
+
+
+def _numeric_types(values):
+    """Per-row type ids when a numeric column mixes types, else None"""
+    kinds = set(map(type, values))
+    if len(kinds) < 2 or not kinds <= set(NUMERIC_TYPES):
+        return None
+    return array('B', [NUMERIC_TYPE_IDS[type(value)] for value in values])
+
+
+def _encode_objects(objects, classes, skip=()):
+    """
+    Scalar attributes of objects as columns, grouped by class: column
+    "Class.attribute" holds one value per object of that class, and the
+    "class" column records each object's class id in original order.
+    Every object's class must be one of classes (name -> class) so the
+    snapshot can be loaded again.
+    Returns (columns, {class name: attribute names}).
+    """
+    groups = {}
+    for obj in objects:
+        groups.setdefault(type(obj).__name__, []).append(obj)
+    for name, members in groups.items():
+        if classes.get(name) is not type(members[0]):
+            raise SnapshotError(f"{name} is not a snapshot class; expected one of {', '.join(classes)}")
+    class_names = list(groups)
+    class_ids = {name: i for i, name in enumerate(class_names)}
+    columns = {"class": array('B', (class_ids[type(obj).__name__] for obj in objects))}
+    class_attributes = {}
+    for name, members in groups.items():
+        attributes = [attribute for attribute in vars(members[0]) if attribute not in skip]
+        class_attributes[name] = attributes
+        if len(attributes) == 1:
+            transposed = [[vars(obj)[attributes[0]] for obj in members]]
+        else:
+            rows = map(itemgetter(*attributes), (vars(obj) for obj in members))
+            transposed = list(zip(*rows)) or [[] for _ in attributes]
+        for attribute, values in zip(attributes, transposed):
+            typecode = _scalar_typecode(values)
+            if typecode is None:
+                raise SnapshotError(f"{name}.{attribute} cannot be stored in a snapshot")
+            columns[f"{name}.{attribute}"] = list(values) if typecode == "str" else array(typecode, values)
+            if typecode != "str":
+                types = _numeric_types(values)
+                if types is not None:
+                    # Mixed column: remember each value's type so it loads back unchanged
+                    columns[f"{name}.{attribute}#types"] = types
+    return columns, class_attributes
+
+
+def _decode_objects(snapshot, classes):
+    """Rebuild objects from a snapshot written by _encode_objects"""
+    class_attributes = snapshot.meta["classes"]
+    restored = []
+    for name, attributes in class_attributes.items():
+        cls = classes.get(name)
+        if cls is None:
+            raise SnapshotError(f"Snapshot contains unknown class {name!r}")
+        columns = []
+        for attribute in attributes:
+            column = snapshot.column(f"{name}.{attribute}")
+            if isinstance(column, StringColumn):
+                column = column.to_list()
+            elif column.format == 'B':
+                column = list(map(bool, column))
+            elif f"{name}.{attribute}#types" in snapshot:
+                types = snapshot.column(f"{name}.{attribute}#types")
+                column = [NUMERIC_TYPES[kind](value) for kind, value in zip(types, column)]
+            columns.append(column)
+        members = []
+        new = cls.__new__
+        for values in zip(*columns):
+            obj = new(cls)
+            obj.__dict__ = dict(zip(attributes, values))
+            members.append(obj)
+        restored.append(iter(members))
+    return [next(restored[class_id]) for class_id in snapshot.column("class")]
+
+
+def _has_attribute(snapshot, attribute):
+    return all(attribute in attributes for attributes in snapshot.meta["classes"].values())
+
+
+def save_vehicles(vehicles, path):
+    """Checkpoint a list of vehicles"""
+    columns, class_attributes = _encode_objects(vehicles, VEHICLE_CLASSES)
+    write_snapshot(path, "vehicles", columns, {"classes": class_attributes})
+
+
+def load_vehicles(path):
+    """Restore vehicles saved with save_vehicles"""
+    with Snapshot(path) as snapshot:
+        if snapshot.kind != "vehicles":
+            raise SnapshotError(f"Expected a vehicles snapshot, got {snapshot.kind!r}")
+        vehicles = _decode_objects(snapshot, VEHICLE_CLASSES)
+        if not _has_attribute(snapshot, "state"):
+            # Snapshots taken before vehicles carried a state id
+            for vehicle in vehicles:
+                resync(vehicle)
+    return vehicles
+
+
+SIMULATION_COLUMNS = ("kind", "active", "x", "y", "heading_x", "heading_y",
+                      "speed", "target_speed", "acceleration", "altitude", "ceiling")
+
+
+def save_simulation(simulation, path):
+    """Checkpoint a TrafficSimulation: vehicles plus its state arrays as raw columns"""
+    columns, class_attributes = _encode_objects(simulation.vehicles, VEHICLE_CLASSES)
+    for name in SIMULATION_COLUMNS:
+        columns["sim." + name] = getattr(simulation, name)
+    write_snapshot(path, "simulation", columns, {
+        "classes": class_attributes, "dt": simulation.dt, "ticks": simulation.ticks,
+        "vehicle_types": [vehicle_type.__name__ for vehicle_type in VEHICLE_TYPES],
+    })
+
+
+def load_simulation(path):
+    """Restore a TrafficSimulation saved with save_simulation"""
+    with Snapshot(path) as snapshot:
+        if snapshot.kind != "simulation":
+            raise SnapshotError(f"Expected a simulation snapshot, got {snapshot.kind!r}")
+        if snapshot.meta["vehicle_types"] != [t.__name__ for t in VEHICLE_TYPES]:
+            raise SnapshotError("Snapshot vehicle type order no longer matches vehicle_simulation")
+        simulation = TrafficSimulation(dt=snapshot.meta["dt"])
+        simulation.ticks = snapshot.meta["ticks"]
+        simulation.vehicles = _decode_objects(snapshot, VEHICLE_CLASSES)
+        for name in SIMULATION_COLUMNS:
+            if name == "acceleration" and "sim.acceleration" not in snapshot:
+                # Written before per-vehicle acceleration: use the type defaults
+                simulation.acceleration = array('d', (MOTION_RULES[VEHICLE_TYPES[kind]].acceleration
+                                                      for kind in simulation.kind))
+                continue
+            column = snapshot.column("sim." + name)
+            values = array(column.format)
+            with column.cast('B') as raw:
+                values.frombytes(raw)
+            setattr(simulation, name, values)
+    for index, kind in enumerate(simulation.kind):
+        simulation._groups[kind].append(index)
+    return simulation
+
+
+# Phone attributes that hold nested stores rather than scalars
+PHONE_STORES = ("_installed_apps", "_contacts", "_messages", "_photos", "_status", "_status_text")
+
+
+def save_phones(phones, path):
+    """Checkpoint a list of smartphones including apps, contacts, messages and photos"""
+    columns, class_attributes = _encode_objects(phones, PHONE_CLASSES, skip=PHONE_STORES)
+
+    app_device, app_name, app_size = array('I'), [], array('d')
+    contact_device, contact_name, contact_number = array('I'), [], []
+    message_device, message_time, message_to, message_body = array('I'), array('d'), [], []
+    photo_device, photo_time, photo_name = array('I'), array('d'), []
+    message_total, photo_total = array('q'), array('q')
+    for device, phone in enumerate(phones):
+        registry = phone.installed_apps
+        for name in registry:
+            app_device.append(device)
+            app_name.append(name)
+            app_size.append(registry.size_of(name))
+        for name, number in phone._contacts:
+            contact_device.append(device)
+            contact_name.append(name)
+            contact_number.append(number)
+        for timestamp, number, body in phone._messages:
+            message_device.append(device)
+            message_time.append(timestamp)
+            message_to.append(number)
+            message_body.append(body)
+        for timestamp, filename in phone._photos:
+            photo_device.append(device)
+            photo_time.append(timestamp)
+            photo_name.append(filename.rsplit("_", 1)[0])
+        message_total.append(phone._messages.total)
+        photo_total.append(phone._photos.total)
+
+    columns.update({
+        "app.device": app_device, "app.name": app_name, "app.size": app_size,
+        "contact.device": contact_device, "contact.name": contact_name,
+        "contact.number": contact_number,
+        "message.device": message_device, "message.time": message_time,
+        "message.to": message_to, "message.body": message_body,
+        "message.total": message_total,
+        "photo.device": photo_device, "photo.time": photo_time, "photo.prefix": photo_name,
+        "photo.total": photo_total,
+    })
+    write_snapshot(path, "phones", columns, {"classes": class_attributes})
+
+
+def load_phones(path):
+    """Restore smartphones saved with save_phones"""
+    with Snapshot(path) as snapshot:
+        if snapshot.kind != "phones":
+            raise SnapshotError(f"Expected a phones snapshot, got {snapshot.kind!r}")
+        phones = _decode_objects(snapshot, PHONE_CLASSES)
+        for phone in phones:
+            phone._installed_apps = AppRegistry(phone._storage_gb * 1024)
+            phone._contacts = ContactBook()
+            phone._messages = MessageLog(phone.message_history_limit)
+            phone._photos = PhotoLog(phone.photo_history_limit)
+            phone._status = None
+            phone._status_text = None
+
+        for device, name, size in zip(snapshot.column("app.device"), snapshot.column("app.name"),
+                                      snapshot.column("app.size")):
+            phones[device]._installed_apps.add(name, int(size) if size.is_integer() else size)
+
+        contacts = [[] for _ in phones]
+        for device, name, number in zip(snapshot.column("contact.device"),
+                                        snapshot.column("contact.name"),
+                                        snapshot.column("contact.number")):
+            contacts[device].append((name, number))
+        for phone, book in zip(phones, contacts):
+            if book:
+                phone._contacts.import_contacts(book)
+
+        for device, timestamp, number, body in zip(snapshot.column("message.device"),
+                                                   snapshot.column("message.time"),
+                                                   snapshot.column("message.to"),
+                                                   snapshot.column("message.body")):
+            phones[device]._messages.append(number, body, timestamp)
+
+        for device, timestamp, prefix in zip(snapshot.column("photo.device"),
+                                             snapshot.column("photo.time"),
+                                             snapshot.column("photo.prefix")):
+            phones[device]._photos.append(prefix, timestamp)
+        for phone, messages, photos in zip(phones, snapshot.column("message.total"),
+                                           snapshot.column("photo.total")):
+            phone._messages._total = messages
+            phone._photos._total = photos
+    Smartphone.device_count += len(phones)
+    return phones
@@ -0,0 +1,192 @@
+"""
+Fuel and Energy Model
+Per-tick fuel (or, for bicycles, rider energy) consumption for vehicles in a
+TrafficSimulation, with fleet telemetry kept as streaming reductions so
+memory stays constant however long the simulation runs
+"""
+
+import math
+from array import array
+from collections import namedtuple
+
+from Assignment5b import Car, Motorcycle, Airplane, Boat, Bicycle, Helicopter
+from vehicle_fsm import fire
+from vehicle_simulation import VEHICLE_TYPES, random_traffic
+
+
+# Per-type consumption parameters
+#   unit            : what is consumed ("L" of fuel, "kcal" for human power)
+#   tank            : full tank / rider energy reserve, in unit
+#   idle_per_hour   : consumed per hour just by running
+#   per_km          : consumed per km at low speed
+#   drag            : extra per km per (km/h)^2, the speed-dependent part
+#   per_1000ft      : consumed per 1000 ft climbed
+#   thin_air        : altitude in feet at which drag is halved (None if unaffected)
+FuelRule = namedtuple("FuelRule", [
+    "unit", "tank", "idle_per_hour", "per_km", "drag", "per_1000ft", "thin_air",
+])
+
+FUEL_RULES = {
+    Car:        FuelRule("L", 60, 0.8, 0.05, 4e-6, 0, None),
+    Motorcycle: FuelRule("L", 15, 0.4, 0.03, 3e-6, 0, None),
+    Airplane:   FuelRule("L", 5000, 20.0, 0.20, 2e-7, 3.0, 20000),
+    Boat:       FuelRule("L", 150, 3.0, 0.30, 1e-4, 0, None),
+    Bicycle:    FuelRule("kcal", 2000, 0, 20.0, 0.02, 0, None),
+    Helicopter: FuelRule("L", 300, 40.0, 0.50, 5e-6, 1.5, 15000),
+}
+
+
+def consumption(rule, speed, distance_km, hours, altitude, climbed_ft):
+    """Amount consumed in one tick"""
+    drag = rule.drag
+    if rule.thin_air is not None:
+        drag /= 1.0 + altitude / rule.thin_air
+    return (rule.idle_per_hour * hours
+            + distance_km * (rule.per_km + drag * speed * speed)
+            + rule.per_1000ft * climbed_ft / 1000.0)
+
+
+class StreamingHistogram:
+    """Fixed-bin histogram plus running count/sum/min/max; O(bins) memory"""
+
+    def __init__(self, edges):
+        self.edges = list(edges)               # ascending upper bin edges
+        self.counts = array('L', bytes(array('L').itemsize * (len(self.edges) + 1)))
+        self.count = 0
+        self.total = 0.0
+        self.minimum = math.inf
+        self.maximum = -math.inf
+
+    def add(self, value):
+        index = 0
+        edges = self.edges
+        while index < len(edges) and value > edges[index]:
+            index += 1
+        self.counts[index] += 1
+        self.count += 1
+        self.total += value
+        if value < self.minimum:
+            self.minimum = value
+        if value > self.maximum:
+            self.maximum = value
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+    def bins(self):
+        """(label, count) per bin, the last bin being everything above the top edge"""
+        labels = [f"<={edge:g}" for edge in self.edges] + [f">{self.edges[-1]:g}"]
+        return list(zip(labels, self.counts))
+
+
+SPEED_EDGES = (0, 20, 50, 100, 200, 400, 800)
+
+
+class FleetTelemetry:
+    """
+    Tracks the fuel left in every vehicle and aggregates consumption per
+    vehicle type with running sums and histograms. Nothing is kept per
+    tick; vehicles that run dry are stopped (engine off) and stay stopped
+    while their tank is empty, counted once as stranded.
+    """
+
+    def __init__(self, simulation):
+        self.simulation = simulation
+        self.fuel_left = array('d', (FUEL_RULES[VEHICLE_TYPES[kind]].tank
+                                     for kind in simulation.kind))
+        self._previous_altitude = array('d', simulation.altitude)
+        kinds = len(VEHICLE_TYPES)
+        self.used = array('d', bytes(8 * kinds))
+        self.distance = array('d', bytes(8 * kinds))
+        self.active_ticks = array('d', bytes(8 * kinds))
+        self.stranded = array('L', bytes(array('L').itemsize * kinds))
+        self.speed_histograms = [StreamingHistogram(SPEED_EDGES) for _ in range(kinds)]
+        self.ticks = 0
+        simulation.observers.append(self.observe)
+
+    def observe(self, simulation):
+        """Account for the tick the simulation just completed"""
+        hours = simulation.dt / 3600.0
+        kind = simulation.kind
+        active = simulation.active
+        speed = simulation.speed
+        target_speed = simulation.target_speed
+        altitude = simulation.altitude
+        previous = self._previous_altitude
+        fuel_left = self.fuel_left
+        rules = [FUEL_RULES[vehicle_type] for vehicle_type in VEHICLE_TYPES]
+        for i in range(len(fuel_left)):
+            if not active[i]:
+                continue
+            if fuel_left[i] <= 0:
+                # Restarted with an empty tank (e.g. via refresh_state); already counted
+                self._stop(simulation, i)
+                continue
+            k = kind[i]
+            v = speed[i]
+            distance = v * hours
+            used = consumption(rules[k], v, distance, hours, altitude[i],
+                               max(0.0, altitude[i] - previous[i]))
+            previous[i] = altitude[i]
+            self.used[k] += used
+            self.distance[k] += distance
+            self.active_ticks[k] += 1
+            self.speed_histograms[k].add(v)
+            left = fuel_left[i] - used
+            if left <= 0:
+                left = 0.0
+                self._stop(simulation, i)
+                self.stranded[k] += 1
+            fuel_left[i] = left
+        self.ticks += 1
+
+    @staticmethod
+    def _stop(simulation, i):
+        """Stop vehicle i in the simulation arrays and on the Vehicle object"""
+        simulation.active[i] = 0
+        simulation.speed[i] = 0.0
+        simulation.target_speed[i] = 0.0
+        vehicle = simulation.vehicles[i]
+        if not fire(vehicle, "stop_engine"):
+            vehicle.engine_on = False          # bicycles: the rider is out of energy
+        vehicle.speed = 0
+
+    def summary(self):
+        """Per-type totals: consumption, distance, efficiency and mean speed"""
+        report = {}
+        for k, vehicle_type in enumerate(VEHICLE_TYPES):
+            rule = FUEL_RULES[vehicle_type]
+            distance = self.distance[k]
+            report[vehicle_type.__name__] = {
+                "unit": rule.unit,
+                "used": self.used[k],
+                "distance_km": distance,
+                "per_100km": 100.0 * self.used[k] / distance if distance else None,
+                "mean_speed": self.speed_histograms[k].mean,
+                "stranded": self.stranded[k],
+            }
+        return report
+
+
+def demonstrate_fuel(size=2000, ticks=3600, seed=42):
+    """Simulate an hour of traffic and print fleet fuel telemetry"""
+    print("=" * 60)
+    print("⛽ FLEET FUEL TELEMETRY ⛽")
+    print("=" * 60)
+
+    simulation = random_traffic(size, seed)
+    telemetry = FleetTelemetry(simulation)
+    simulation.run(ticks)
+    print(f"Vehicles: {size:,}  Simulated time: {ticks * simulation.dt / 60:.0f} min\n")
+
+    for name, row in telemetry.summary().items():
+        efficiency = f"{row['per_100km']:.1f} {row['unit']}/100km" if row["per_100km"] else "-"
+        print(f"{name:12s} used {row['used']:12,.1f} {row['unit']:4s} over "
+              f"{row['distance_km']:10,.0f} km  {efficiency:18s} "
+              f"avg {row['mean_speed']:5.0f} km/h  stranded {row['stranded']}")
+
+
+# Main execution
+if __name__ == "__main__":
+    demonstrate_fuel()
@@ -0,0 +1,227 @@
+"""
+Method Profiling
+Opt-in call counters and latency statistics for the Smartphone and Vehicle
+hierarchies, reported per method per subclass
+"""
+
+import functools
+import json
+import math
+import random
+import sys
+import time
+from array import array
+
+
+# Root classes marked with @profiled and the method names to instrument.
+# Nothing is wrapped until a Profiler is enabled, so a disabled profiler
+# costs nothing on the call path.
+_PROFILED = {}
+
+# The Profiler whose wrappers are installed, if any. Only one may be enabled
+# at a time: a second one would wrap the first one's wrappers, and disabling
+# them out of order would leave stale wrappers on the classes.
+_active = None
+
+
+def profiled(*method_names):
+    """Class decorator marking methods of a class and its subclasses for profiling"""
+    def mark(cls):
+        _PROFILED[cls] = method_names
+        return cls
+    return mark
+
+
+def _subclasses(cls):
+    """cls and every class derived from it, parents before children"""
+    seen = [cls]
+    for klass in seen:
+        for sub in klass.__subclasses__():
+            if sub not in seen:
+                seen.append(sub)
+    return seen
+
+
+class MethodStats:
+    """
+    Call count and latency for one method on one class. Latencies of timed
+    calls are kept in a fixed-size reservoir sample, so p99 stays bounded
+    in memory however many calls are made.
+    """
+
+    __slots__ = ("calls", "timed", "total_s", "samples", "_rng")
+
+    def __init__(self, reservoir=1024, seed=0):
+        self.calls = 0
+        self.timed = 0
+        self.total_s = 0.0
+        self.samples = array('d', bytes(8 * reservoir))
+        self._rng = random.Random(seed)
+
+    def record(self, elapsed):
+        timed = self.timed
+        if timed < len(self.samples):
+            self.samples[timed] = elapsed
+        else:
+            slot = self._rng.randrange(timed + 1)
+            if slot < len(self.samples):
+                self.samples[slot] = elapsed
+        self.timed = timed + 1
+        self.total_s += elapsed
+
+    def percentile(self, fraction):
+        kept = sorted(self.samples[:min(self.timed, len(self.samples))])
+        if not kept:
+            return 0.0
+        return kept[min(len(kept) - 1, math.ceil(fraction * len(kept)) - 1)]
+
+    def as_dict(self):
+        """Summary in microseconds; cumulative time is scaled up when sampling"""
+        mean = self.total_s / self.timed if self.timed else 0.0
+        return {
+            "calls": self.calls,
+            "timed_calls": self.timed,
+            "cumulative_us": mean * self.calls * 1e6,
+            "mean_us": mean * 1e6,
+            "p99_us": self.percentile(0.99) * 1e6,
+        }
+
+
+class Profiler:
+    """
+    Wraps every @profiled method while enabled and restores the original
+    functions on disable(). With sample_every=N only every Nth call of a
+    method is timed (all calls are still counted), which keeps the clock
+    reads off high-rate calls such as _use_battery. Only one Profiler can
+    be enabled at a time.
+    """
+
+    def __init__(self, sample_every=1, reservoir=1024):
+        if sample_every < 1:
+            raise ValueError("sample_every must be at least 1")
+        self.sample_every = sample_every
+        self.reservoir = reservoir
+        self.stats = {}                        # (class name, method name) -> MethodStats
+        self._originals = []                   # (class, method name, function) while enabled
+
+    @property
+    def enabled(self):
+        return _active is self
+
+    def __enter__(self):
+        self.enable()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.disable()
+
+    def _stats_for(self, cls, name):
+        key = (cls.__name__, name)
+        stats = self.stats.get(key)
+        if stats is None:
+            stats = self.stats[key] = MethodStats(self.reservoir)
+        return stats
+
+    def _wrap(self, function, name):
+        stats_for = self._stats_for
+        sample_every = self.sample_every
+        clock = time.perf_counter
+
+        @functools.wraps(function)
+        def wrapper(instance, *args, **kwargs):
+            stats = stats_for(type(instance), name)
+            stats.calls += 1
+            if stats.calls % sample_every:
+                return function(instance, *args, **kwargs)
+            start = clock()
+            try:
+                return function(instance, *args, **kwargs)
+            finally:
+                stats.record(clock() - start)
+        return wrapper
+
+    def enable(self):
+        """Install wrappers on every class that defines a profiled method"""
+        global _active
+        if self.enabled:
+            return
+        if _active is not None:
+            raise RuntimeError("another Profiler is already enabled; disable it first")
+        _active = self
+        for root, names in _PROFILED.items():
+            for cls in _subclasses(root):
+                for name in names:
+                    function = cls.__dict__.get(name)
+                    if function is None:
+                        continue
+                    self._originals.append((cls, name, function))
+                    setattr(cls, name, self._wrap(function, name))
+
+    def disable(self):
+        """Put the original methods back; collected statistics are kept"""
+        global _active
+        for cls, name, function in reversed(self._originals):
+            setattr(cls, name, function)
+        self._originals.clear()
+        if _active is self:
+            _active = None
+
+    def reset(self):
+        self.stats.clear()
+
+    def report(self):
+        """{class name: {method name: summary}} for every method called"""
+        report = {}
+        for (class_name, name), stats in sorted(self.stats.items()):
+            report.setdefault(class_name, {})[name] = stats.as_dict()
+        return report
+
+    def dump_json(self, path=None):
+        """Write the report as JSON to path, or stdout when no path is given"""
+        data = {"sample_every": self.sample_every, "methods": self.report()}
+        if path is None:
+            json.dump(data, sys.stdout, indent=2)
+            sys.stdout.write("\n")
+            return
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(data, file, indent=2)
+
+
+def demonstrate_profiling(devices=500, events_per_device=50, vehicles=20_000, seed=0):
+    """Profile a smartphone fleet workload and a vehicle drive loop, hottest first"""
+    from smartphone_simulator import EventScheduler, build_fleet, generate_workload
+    from vehicle_simulation import random_vehicle
+
+    print("=" * 60)
+    print("METHOD PROFILE")
+    print("=" * 60)
+
+    scheduler = EventScheduler(build_fleet(devices, seed))
+    generate_workload(scheduler, events_per_device, seed=seed)
+    rng = random.Random(seed)
+    fleet = [random_vehicle(rng, serial) for serial in range(vehicles)]
+
+    with Profiler(sample_every=4) as profiler:
+        scheduler.run()
+        for phone in scheduler.devices:
+            phone.install_app("Maps", 150)
+            phone.get_status()
+        for vehicle in fleet:
+            vehicle.accelerate(10)
+            vehicle.move()
+            vehicle.get_status()
+
+    rows = [(summary["cumulative_us"], class_name, name, summary)
+            for class_name, methods in profiler.report().items()
+            for name, summary in methods.items()]
+    for cumulative, class_name, name, summary in sorted(rows, reverse=True):
+        print(f"{class_name + '.' + name:28s} {summary['calls']:10,d} calls  "
+              f"{cumulative / 1000:9.1f}ms total  {summary['mean_us']:7.2f}us mean  "
+              f"{summary['p99_us']:7.2f}us p99")
+
+
+# Main execution
+if __name__ == "__main__":
+    # Run through the imported module: the classes register with its _PROFILED
+    import instrumentation
+    instrumentation.demonstrate_profiling()
@@ -1,53 +1,76 @@
-# ============================
-# Task 1: List Input and Sum
-# ============================
-print("Task 1: Sum of a List of Integers")
-numbers = input("Enter integers separated by spaces: ")
-int_list = [int(num) for num in numbers.split()]
-total = sum(int_list)
-print("Your list:", int_list)
-print("Sum of all integers:", total)
-print("-" * 40)
-
-# =================================
-# Task 2: Tuple of Favorite Books
-# =================================
-print("Task 2: Favorite Books (Tuple)")
-favorite_books = ("To Kill a Mockingbird", "1984", "Pride and Prejudice", "The Hobbit", "The Great Gatsby")
-print("My favorite books:")
-for book in favorite_books:
-    print(book)
-print("-" * 40)
-
-# ====================================
-# Task 3: Dictionary with User Info
-# ====================================
-print("Task 3: Personal Information (Dictionary)")
-person_info = {}
-person_info["name"] = input("Enter your name: ")
-person_info["age"] = int(input("Enter your age: "))
-person_info["favorite_color"] = input("Enter your favorite color: ")
-print("Personal Information:")
-print(person_info)
-print("-" * 40)
-
-# ================================
-# Task 4: Sets and Intersection
-# ================================
-print("Task 4: Set Intersection")
-set1_input = input("Enter integers for the first set (separated by spaces): ")
-set2_input = input("Enter integers for the second set (separated by spaces): ")
-set1 = set(int(num) for num in set1_input.split())
-set2 = set(int(num) for num in set2_input.split())
-common_elements = set1 & set2
-print("Common elements:", common_elements)
-print("-" * 40)
-
-# =============================================
-# Task 5: List Comprehension with Word Length
-# =============================================
-print("Task 5: Words with Odd Number of Characters")
-words = ["apple", "banana", "kiwi", "cherry", "grape", "orange"]
-odd_length_words = [word for word in words if len(word) % 2 != 0]
-print("Words with odd number of characters:", odd_length_words)
-print("-" * 40)
+from demo_output import Output, output_from_args
+
+
+def parse_integers(text):
+    """Parse whitespace-separated integers into a list"""
+    return [int(num) for num in text.split()]
+
+
+def common_integers(first, second):
+    """Integers that appear in both whitespace-separated inputs"""
+    set1 = set(int(num) for num in first.split())
+    set2 = set(int(num) for num in second.split())
+    return set1 & set2
+
+
+def main(out=None):
+    """Run the five tasks, reading answers through out.prompt()"""
+    if out is None:
+        with Output() as out:
+            return main(out=out)
+    # ============================
+    # Task 1: List Input and Sum
+    # ============================
+    out.line("Task 1: Sum of a List of Integers")
+    numbers = out.prompt("Enter integers separated by spaces: ")
+    int_list = parse_integers(numbers)
+    total = sum(int_list)
+    out.line("Your list: {}", int_list)
+    out.line("Sum of all integers: {}", total)
+    out.line("-" * 40)
+
+    # =================================
+    # Task 2: Tuple of Favorite Books
+    # =================================
+    out.line("Task 2: Favorite Books (Tuple)")
+    favorite_books = ("To Kill a Mockingbird", "1984", "Pride and Prejudice", "The Hobbit", "The Great Gatsby")
+    out.line("My favorite books:")
+    for book in favorite_books:
+        out.line("{}", book)
+    out.line("-" * 40)
+
+    # ====================================
+    # Task 3: Dictionary with User Info
+    # ====================================
+    out.line("Task 3: Personal Information (Dictionary)")
+    person_info = {}
+    person_info["name"] = out.prompt("Enter your name: ")
+    person_info["age"] = int(out.prompt("Enter your age: "))
+    person_info["favorite_color"] = out.prompt("Enter your favorite color: ")
+    out.line("Personal Information:")
+    out.line("{}", person_info)
+    out.line("-" * 40)
+
+    # ================================
+    # Task 4: Sets and Intersection
+    # ================================
+    out.line("Task 4: Set Intersection")
+    set1_input = out.prompt("Enter integers for the first set (separated by spaces): ")
+    set2_input = out.prompt("Enter integers for the second set (separated by spaces): ")
+    common_elements = common_integers(set1_input, set2_input)
+    out.line("Common elements: {}", common_elements)
+    out.line("-" * 40)
+
+    # =============================================
+    # Task 5: List Comprehension with Word Length
+    # =============================================
+    out.line("Task 5: Words with Odd Number of Characters")
+    words = ["apple", "banana", "kiwi", "cherry", "grape", "orange"]
+    odd_length_words = [word for word in words if len(word) % 2 != 0]
+    out.line("Words with odd number of characters: {}", odd_length_words)
+    out.line("-" * 40)
+    out.flush()
+
+
+if __name__ == "__main__":
+    main(output_from_args())
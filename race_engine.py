@@ -0,0 +1,167 @@
+"""
+Monte Carlo Race Engine
+Runs many independent vehicle races over seeds and randomised vehicle
+parameters, sharded across worker processes
+"""
+
+import os
+import random
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+
+from Assignment5b import Car, Motorcycle, Airplane, Boat
+from vehicle_simulation import TrafficSimulation, MOTION_RULES
+
+# The line-up from vehicle_race_challenge()
+RACE_ENTRANTS = [
+    (Car, ("Ferrari", "488", "Gasoline", 2)),
+    (Motorcycle, ("Ducati", "Panigale", "Gasoline", 1100)),
+    (Airplane, ("Cessna", "172", "Avgas", 10000)),
+    (Boat, ("Formula", "350", "Gasoline", "Racing Boat")),
+]
+
+# Sentinel finish time for entrants that did not finish within max_ticks
+DID_NOT_FINISH = float("inf")
+# Winner index recorded for races in which no entrant finished
+NO_WINNER = 255
+
+
+def simulate_race(seed, distance_km=5.0, max_ticks=3600, dt=1.0):
+    """
+    Run one race and return each entrant's finish time in seconds.
+    Each entrant's target speed is drawn between 70% and 100% of its
+    type's max speed and its acceleration between 80% and 120% of the
+    type's default, so results vary with the seed.
+    """
+    rng = random.Random(seed)
+    simulation = TrafficSimulation(dt=dt)
+    for vehicle_class, args in RACE_ENTRANTS:
+        vehicle = vehicle_class(*args)
+        vehicle.start_engine()
+        if isinstance(vehicle, Boat):
+            vehicle.raise_anchor()
+        rule = MOTION_RULES[vehicle_class]
+        simulation.add(vehicle, target_speed=rule.max_speed * rng.uniform(0.7, 1.0),
+                       acceleration=rule.acceleration * rng.uniform(0.8, 1.2))
+
+    entrants = len(RACE_ENTRANTS)
+    finish = [DID_NOT_FINISH] * entrants
+    remaining = entrants
+    x = simulation.x
+    for tick in range(1, max_ticks + 1):
+        before = list(x)
+        simulation.step()
+        for i in range(entrants):
+            if finish[i] == DID_NOT_FINISH and x[i] >= distance_km:
+                # Interpolate within the tick for the crossing time
+                covered = x[i] - before[i]
+                finish[i] = (tick - 1 + (distance_km - before[i]) / covered) * dt
+                remaining -= 1
+        if not remaining:
+            break
+    return finish
+
+
+def _run_shard(seeds, distance_km, max_ticks):
+    """Worker: run races for a range of seeds, returning compact arrays"""
+    winners = array('B')
+    times = array('d')
+    for seed in seeds:
+        finish = simulate_race(seed, distance_km, max_ticks)
+        winner = min(range(len(finish)), key=finish.__getitem__)
+        winners.append(NO_WINNER if finish[winner] == DID_NOT_FINISH else winner)
+        times.extend(finish)
+    return winners, times
+
+
+class RaceResults:
+    """Winners and finish times for a batch of races, stored as flat arrays"""
+
+    def __init__(self, winners, finish_times, elapsed, workers):
+        self.winners = winners                 # entrant index per race, or NO_WINNER
+        self.finish_times = finish_times       # races x entrants, row-major
+        self.elapsed = elapsed
+        self.workers = workers
+
+    def __len__(self):
+        return len(self.winners)
+
+    @property
+    def races_per_second(self):
+        return len(self.winners) / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def unfinished_races(self):
+        """Races in which no entrant crossed the line"""
+        return self.winners.count(NO_WINNER)
+
+    def win_distribution(self):
+        """Fraction of finished races won by each entrant, keyed by class name"""
+        counts = [0] * len(RACE_ENTRANTS)
+        for winner in self.winners:
+            if winner != NO_WINNER:
+                counts[winner] += 1
+        total = sum(counts) or 1
+        return {vehicle_class.__name__: n / total
+                for (vehicle_class, _), n in zip(RACE_ENTRANTS, counts)}
+
+    def mean_finish_times(self):
+        """Average finish time per entrant over races it finished"""
+        entrants = len(RACE_ENTRANTS)
+        means = {}
+        for i, (vehicle_class, _) in enumerate(RACE_ENTRANTS):
+            finished = [t for t in self.finish_times[i::entrants] if t != DID_NOT_FINISH]
+            means[vehicle_class.__name__] = sum(finished) / len(finished) if finished else None
+        return means
+
+
+def run_races(races, workers=None, seed=0, distance_km=5.0, max_ticks=3600, shards_per_worker=4):
+    """
+    Run races with consecutive seeds starting at seed.
+    With more than one worker the seeds are split into shards and run on
+    a ProcessPoolExecutor; shards come back as arrays and are merged in
+    seed order.
+    """
+    workers = workers or os.cpu_count() or 1
+    seeds = range(seed, seed + races)
+    start = time.perf_counter()
+    if workers == 1 or races <= 0:
+        winners, times = _run_shard(seeds, distance_km, max_ticks)
+    else:
+        shard_count = min(races, workers * shards_per_worker)
+        shard_size = -(-races // shard_count)
+        shards = [seeds[i:i + shard_size] for i in range(0, races, shard_size)]
+        winners, times = array('B'), array('d')
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for shard_winners, shard_times in pool.map(
+                    _run_shard, shards, [distance_km] * len(shards), [max_ticks] * len(shards)):
+                winners.extend(shard_winners)
+                times.extend(shard_times)
+    return RaceResults(winners, times, time.perf_counter() - start, workers)
+
+
+def demonstrate_race_engine(races=2000, seed=0):
+    """Monte Carlo race report plus throughput as the worker count grows"""
+    print("=" * 60)
+    print("🏁 MONTE CARLO RACE ENGINE 🏁")
+    print("=" * 60)
+
+    max_workers = os.cpu_count() or 1
+    worker_counts = sorted({1, 2, 4, max_workers} & set(range(1, max_workers + 1)))
+    results = None
+    print("THROUGHPUT:")
+    for workers in worker_counts:
+        results = run_races(races, workers, seed)
+        print(f"{workers:3d} workers: {results.races_per_second:10,.0f} races/s")
+
+    print(f"\nWIN DISTRIBUTION ({len(results):,} races):")
+    means = results.mean_finish_times()
+    for name, share in results.win_distribution().items():
+        mean = f"{means[name]:.1f}s" if means[name] is not None else "DNF"
+        print(f"{name:12s} {share:7.1%} wins, mean finish {mean}")
+
+
+# Main execution
+if __name__ == "__main__":
+    demonstrate_race_engine()
@@ -0,0 +1,208 @@
+"""
+Discrete-Event Smartphone Simulator
+Drives fleets of Assignment5a smartphones through calls, messages, games,
+photos and charging scheduled over simulated time
+"""
+
+import heapq
+import random
+import time
+from collections import Counter
+from itertools import count
+
+from Assignment5a import Smartphone, GamingPhone, CameraPhone
+from demo_output import Event, EventType, is_failure
+
+
+def _handle_power_on(scheduler, device, payload):
+    return device.power_on()
+
+
+CALL_LINE_BUSY = Event((EventType("call", "❌ Cannot call - line busy", ok=False),))
+
+
+def _handle_call(scheduler, device, payload):
+    number, duration = payload
+    if device.current_call is not None:
+        return CALL_LINE_BUSY
+    result = device.make_call(number)
+    if not is_failure(result):
+        scheduler.schedule(scheduler.now + duration, "end_call", scheduler.index_of(device), number)
+    return result
+
+
+def _handle_end_call(scheduler, device, payload):
+    # Only hang up the call this event was scheduled for
+    if device.current_call != payload:
+        return f"❌ No active call with {payload}"
+    return device.end_call()
+
+
+def _handle_message(scheduler, device, payload):
+    number, text = payload
+    return device.send_message(number, text)
+
+
+def _handle_game(scheduler, device, payload):
+    if not isinstance(device, GamingPhone):
+        return "❌ Not a gaming phone"
+    return device.play_game(payload)
+
+
+def _handle_photo(scheduler, device, payload):
+    return device.take_photo()
+
+
+def _handle_charge(scheduler, device, payload):
+    return device.charge(payload)
+
+
+# Event type -> handler(scheduler, device, payload) returning the method's result
+EVENT_HANDLERS = {
+    "power_on": _handle_power_on,
+    "call": _handle_call,
+    "end_call": _handle_end_call,
+    "message": _handle_message,
+    "game": _handle_game,
+    "photo": _handle_photo,
+    "charge": _handle_charge,
+}
+
+
+class EventScheduler:
+    """
+    Heap-based discrete-event engine.
+    Events are (time, sequence, type, device index, payload) tuples; the
+    sequence number keeps ordering stable for events at the same time.
+    """
+
+    def __init__(self, devices):
+        self.devices = list(devices)
+        self._device_indexes = {id(device): i for i, device in enumerate(self.devices)}
+        self.now = 0.0
+        self._queue = []
+        self._sequence = count()
+        self.processed = Counter()             # event type -> events handled
+        self.rejected = Counter()              # event type -> events the device refused
+        self.wall_time = 0.0
+
+    def __len__(self):
+        """Number of pending events"""
+        return len(self._queue)
+
+    def index_of(self, device):
+        return self._device_indexes[id(device)]
+
+    def schedule(self, at, event_type, device_index, payload=None):
+        """Queue an event for simulated time at"""
+        if event_type not in EVENT_HANDLERS:
+            raise ValueError(f"Unknown event type: {event_type}")
+        heapq.heappush(self._queue, (at, next(self._sequence), event_type, device_index, payload))
+
+    def run(self, until=None):
+        """Process events in time order (up to simulated time until); returns events handled"""
+        queue = self._queue
+        devices = self.devices
+        processed = self.processed
+        rejected = self.rejected
+        handled = 0
+        start = time.perf_counter()
+        while queue and (until is None or queue[0][0] <= until):
+            at, _, event_type, device_index, payload = heapq.heappop(queue)
+            self.now = at
+            result = EVENT_HANDLERS[event_type](self, devices[device_index], payload)
+            processed[event_type] += 1
+            if is_failure(result):
+                rejected[event_type] += 1
+            handled += 1
+        if until is not None:
+            self.now = max(self.now, until)
+        self.wall_time += time.perf_counter() - start
+        return handled
+
+    def throughput(self):
+        """Events per wall-clock second, per event type and in total"""
+        if self.wall_time == 0:
+            return {}
+        rates = {event_type: n / self.wall_time for event_type, n in self.processed.items()}
+        rates["total"] = sum(self.processed.values()) / self.wall_time
+        return rates
+
+
+def build_fleet(size, seed=0):
+    """Create a reproducible mix of regular, gaming and camera phones"""
+    rng = random.Random(seed)
+    fleet = []
+    for i in range(size):
+        kind = rng.random()
+        if kind < 0.5:
+            fleet.append(Smartphone("Samsung", "Galaxy S23", f"SIM{i:09d}", 256, 8, "Android 14"))
+        elif kind < 0.75:
+            fleet.append(GamingPhone("ASUS", "ROG Phone 6", f"SIM{i:09d}", "Adreno 730", 144, 512, 16))
+        else:
+            fleet.append(CameraPhone("Google", "Pixel 8", f"SIM{i:09d}", 50, 1.7, 128, 8))
+    return fleet
+
+
+# Relative frequency of each generated event type
+WORKLOAD_MIX = {"call": 3, "message": 5, "game": 1, "photo": 2, "charge": 2}
+
+
+def generate_workload(scheduler, events_per_device, duration=3600.0, seed=0):
+    """
+    Schedule a seeded random workload: every device powers on at time 0,
+    then receives events_per_device events spread over duration seconds.
+    Game events only go to GamingPhones.
+    """
+    rng = random.Random(seed)
+    event_types = list(WORKLOAD_MIX)
+    weights = list(WORKLOAD_MIX.values())
+    # Only gaming phones are sent game events
+    phone_types = [event_type for event_type in event_types if event_type != "game"]
+    phone_weights = [WORKLOAD_MIX[event_type] for event_type in phone_types]
+    for device_index, device in enumerate(scheduler.devices):
+        scheduler.schedule(0.0, "power_on", device_index)
+        if isinstance(device, GamingPhone):
+            kinds = rng.choices(event_types, weights, k=events_per_device)
+        else:
+            kinds = rng.choices(phone_types, phone_weights, k=events_per_device)
+        for event_type in kinds:
+            at = rng.uniform(0.0, duration)
+            if event_type == "call":
+                payload = (f"555-{rng.randrange(10000):04d}", rng.uniform(10.0, 300.0))
+            elif event_type == "message":
+                payload = (f"555-{rng.randrange(10000):04d}", "Hello!")
+            elif event_type == "game":
+                payload = "Call of Duty Mobile"
+            elif event_type == "charge":
+                payload = rng.randint(5, 30)
+            else:
+                payload = None
+            scheduler.schedule(at, event_type, device_index, payload)
+
+
+def demonstrate_simulation(devices=1000, events_per_device=50, seed=42):
+    """Run a seeded workload and report per-event-type counts and throughput"""
+    print("=" * 60)
+    print("SMARTPHONE EVENT SIMULATION")
+    print("=" * 60)
+
+    scheduler = EventScheduler(build_fleet(devices, seed))
+    generate_workload(scheduler, events_per_device, seed=seed)
+    print(f"Devices: {devices}, events scheduled: {len(scheduler)}")
+
+    scheduler.run()
+    rates = scheduler.throughput()
+
+    print("\nEVENTS PROCESSED:")
+    print("-" * 40)
+    for event_type, n in sorted(scheduler.processed.items()):
+        print(f"{event_type:10s} {n:10,d} handled {scheduler.rejected[event_type]:10,d} rejected "
+              f"{rates[event_type]:12,.0f}/s")
+    print("-" * 40)
+    print(f"Total: {rates['total'] * 60:,.0f} events per minute")
+
+
+# Main execution
+if __name__ == "__main__":
+    demonstrate_simulation()
@@ -0,0 +1,172 @@
+"""
+Spatial Index for Vehicle Proximity Queries
+Uniform 3D grid over vehicle positions with incremental updates,
+radius queries and k-nearest-neighbour queries
+"""
+
+import heapq
+import math
+
+# Altitudes are tracked in feet; the index works in km on every axis
+FEET_TO_KM = 0.0003048
+
+
+class SpatialIndex:
+    """
+    Uniform grid hash: each item lives in the cube of side cell_size (km)
+    containing it. Queries only visit cells that can hold a match, so
+    their cost depends on local density rather than fleet size.
+    """
+
+    def __init__(self, cell_size=1.0):
+        self.cell_size = cell_size
+        self._cells = {}                       # (cx, cy, cz) -> set of item ids
+        self._positions = {}                   # item id -> (x, y, z)
+        self._item_cells = {}                  # item id -> (cx, cy, cz)
+        self._low = None                       # grow-only bounds of occupied cells
+        self._high = None
+
+    def __len__(self):
+        return len(self._positions)
+
+    def __contains__(self, item):
+        return item in self._positions
+
+    def _cell_of(self, x, y, z):
+        size = self.cell_size
+        return (math.floor(x / size), math.floor(y / size), math.floor(z / size))
+
+    def _grow_bounds(self, cell):
+        if self._low is None:
+            self._low, self._high = cell, cell
+        else:
+            self._low = tuple(map(min, self._low, cell))
+            self._high = tuple(map(max, self._high, cell))
+
+    def insert(self, item, x, y, z=0.0):
+        """Add item at (x, y, z) km, or move it there if already present"""
+        if item in self._positions:
+            self.update(item, x, y, z)
+            return
+        cell = self._cell_of(x, y, z)
+        self._positions[item] = (x, y, z)
+        self._item_cells[item] = cell
+        self._cells.setdefault(cell, set()).add(item)
+        self._grow_bounds(cell)
+
+    def update(self, item, x, y, z=0.0):
+        """Move item; only touches the grid when it crosses into another cell"""
+        self._positions[item] = (x, y, z)
+        cell = self._cell_of(x, y, z)
+        old_cell = self._item_cells[item]
+        if cell != old_cell:
+            members = self._cells[old_cell]
+            members.discard(item)
+            if not members:
+                del self._cells[old_cell]
+            self._cells.setdefault(cell, set()).add(item)
+            self._item_cells[item] = cell
+            self._grow_bounds(cell)
+
+    def remove(self, item):
+        del self._positions[item]
+        cell = self._item_cells.pop(item)
+        members = self._cells[cell]
+        members.discard(item)
+        if not members:
+            del self._cells[cell]
+
+    def position(self, item):
+        return self._positions[item]
+
+    def within(self, x, y, z, radius):
+        """Items within radius km of (x, y, z), nearest first, as (distance, item)"""
+        size = self.cell_size
+        low = self._cell_of(x - radius, y - radius, z - radius)
+        high = self._cell_of(x + radius, y + radius, z + radius)
+        radius_squared = radius * radius
+        cells = self._cells
+        positions = self._positions
+        found = []
+        for cx in range(low[0], high[0] + 1):
+            for cy in range(low[1], high[1] + 1):
+                for cz in range(low[2], high[2] + 1):
+                    members = cells.get((cx, cy, cz))
+                    if not members:
+                        continue
+                    for item in members:
+                        px, py, pz = positions[item]
+                        distance_squared = (px - x) ** 2 + (py - y) ** 2 + (pz - z) ** 2
+                        if distance_squared <= radius_squared:
+                            found.append((math.sqrt(distance_squared), item))
+        found.sort(key=lambda pair: pair[0])
+        return found
+
+    def _shell(self, center, ring):
+        """Cells at Chebyshev distance ring from center, clipped to occupied bounds"""
+        cx, cy, cz = center
+        low, high = self._low, self._high
+        for dx in range(max(-ring, low[0] - cx), min(ring, high[0] - cx) + 1):
+            for dy in range(max(-ring, low[1] - cy), min(ring, high[1] - cy) + 1):
+                for dz in range(max(-ring, low[2] - cz), min(ring, high[2] - cz) + 1):
+                    if max(abs(dx), abs(dy), abs(dz)) == ring:
+                        yield (cx + dx, cy + dy, cz + dz)
+
+    def nearest(self, x, y, z, k=1, exclude=None):
+        """The k items closest to (x, y, z) as (distance, item), nearest first"""
+        if not self._positions or k <= 0:
+            return []
+        center = self._cell_of(x, y, z)
+        max_ring = max(max(abs(c - l), abs(h - c))
+                       for c, l, h in zip(center, self._low, self._high))
+        cells = self._cells
+        positions = self._positions
+        best = []                              # max-heap of (-distance, item)
+        for ring in range(max_ring + 1):
+            for cell in self._shell(center, ring):
+                for item in cells.get(cell, ()):
+                    if item == exclude:
+                        continue
+                    px, py, pz = positions[item]
+                    distance = math.sqrt((px - x) ** 2 + (py - y) ** 2 + (pz - z) ** 2)
+                    if len(best) < k:
+                        heapq.heappush(best, (-distance, item))
+                    elif distance < -best[0][0]:
+                        heapq.heapreplace(best, (-distance, item))
+            # Anything in an unvisited cell is at least ring * cell_size away
+            if len(best) == k and -best[0][0] <= ring * self.cell_size:
+                break
+        return sorted(((-negative, item) for negative, item in best), key=lambda pair: pair[0])
+
+    def close_pairs(self, radius):
+        """All (item, other) pairs closer than radius km, each pair reported once"""
+        pairs = []
+        for item, (x, y, z) in self._positions.items():
+            for _, other in self.within(x, y, z, radius):
+                if item < other:
+                    pairs.append((item, other))
+        return pairs
+
+
+def index_simulation(simulation, cell_size=1.0, index=None):
+    """
+    Build or refresh a SpatialIndex from a TrafficSimulation, keyed by
+    vehicle index. Passing an existing index updates it incrementally.
+    """
+    if index is None:
+        index = SpatialIndex(cell_size)
+    xs, ys, altitudes = simulation.x, simulation.y, simulation.altitude
+    for item in range(len(simulation)):
+        x, y, z = xs[item], ys[item], altitudes[item] * FEET_TO_KM
+        if item in index:
+            index.update(item, x, y, z)
+        else:
+            index.insert(item, x, y, z)
+    return index
+
+
+def brute_force_within(points, x, y, z, radius):
+    """Reference linear scan over a list of (x, y, z) points"""
+    radius_squared = radius * radius
+    return [item for item, (px, py, pz) in enumerate(points)
+            if (px - x) ** 2 + (py - y) ** 2 + (pz - z) ** 2 <= radius_squared]
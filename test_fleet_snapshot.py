@@ -0,0 +1,125 @@
+"""
+Round-trip tests for the fleet snapshot format
+"""
+
+import os
+import struct
+import tempfile
+import unittest
+
+from Assignment5a import Smartphone, GamingPhone, CameraPhone
+from Assignment5b import Car, Motorcycle, Airplane, Boat, Bicycle, Helicopter
+from fleet_snapshot import (SnapshotError, load_phones, load_simulation, load_vehicles,
+                            save_phones, save_simulation, save_vehicles)
+from vehicle_simulation import TrafficSimulation, random_traffic
+
+
+def _scalars(obj, skip=()):
+    """Attribute name -> (type, value) for an object's plain attributes"""
+    return {name: (type(value), value) for name, value in vars(obj).items() if name not in skip}
+
+
+class SnapshotRoundTripTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "fleet.snap")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_vehicles_keep_int_and_float_speeds(self):
+        still = Car("Toyota", "Camry", "Gasoline")
+        moving = Car("Honda", "Civic", "Gasoline")
+        moving.start_engine()
+        moving.accelerate(2.5)
+        save_vehicles([still, moving], self.path)
+        restored = load_vehicles(self.path)
+        self.assertEqual([_scalars(v) for v in restored], [_scalars(still), _scalars(moving)])
+        self.assertIn("Speed: 0 km/h", restored[0].get_status())
+
+    def test_every_vehicle_type(self):
+        vehicles = [Car("a", "b", "Gasoline"), Motorcycle("a", "b", "Gasoline", 900),
+                    Airplane("a", "b", "Avgas", 10000), Boat("a", "b", "Gasoline", "Speedboat"),
+                    Bicycle("a", "b", 21), Helicopter("a", "b", "Aviation Fuel", 10.7)]
+        for vehicle in vehicles:
+            vehicle.start_engine()
+            vehicle.accelerate(250)
+        vehicles[2].take_off()
+        vehicles[2].altitude = 1500.5
+        save_vehicles(vehicles, self.path)
+        restored = load_vehicles(self.path)
+        self.assertEqual([type(v) for v in restored], [type(v) for v in vehicles])
+        self.assertEqual([_scalars(v) for v in restored], [_scalars(v) for v in vehicles])
+
+    def test_phones_keep_mixed_battery_levels(self):
+        full = Smartphone("Samsung", "Galaxy S23", "IMEI1")
+        partial = Smartphone("Samsung", "Galaxy S23", "IMEI2")
+        gaming = GamingPhone("ASUS", "ROG Phone 6", "IMEI4", "Adreno 730")
+        camera = CameraPhone("Google", "Pixel 8", "IMEI3", 50, 1.7)
+        partial._battery_level = 97.5
+        for phone in (full, partial, gaming, camera):
+            phone.power_on()
+            phone.install_app("Maps", 150)
+            phone.add_contact("Ann", "555-0100")
+            phone.send_message("555-0100", "Hello!")
+            phone.take_photo()
+        phones = [full, partial, gaming, camera]
+        save_phones(phones, self.path)
+        restored = load_phones(self.path)
+        self.assertEqual([p.get_status() for p in restored], [p.get_status() for p in phones])
+        self.assertIs(type(restored[0].battery_level), int)
+        self.assertEqual(restored[1].battery_level, partial.battery_level)
+        self.assertIs(type(restored[1].battery_level), float)
+        self.assertEqual(list(restored[3].installed_apps), ["Maps"])
+
+    def test_bool_and_int_mixed_column(self):
+        first, second = Car("a", "b", "Gasoline"), Car("a", "b", "Gasoline")
+        first.doors, second.doors = True, 4
+        save_vehicles([first, second], self.path)
+        restored = load_vehicles(self.path)
+        self.assertIs(restored[0].doors, True)
+        self.assertIs(type(restored[1].doors), int)
+
+    def test_empty_fleets(self):
+        save_vehicles([], self.path)
+        self.assertEqual(load_vehicles(self.path), [])
+        save_phones([], self.path)
+        self.assertEqual(load_phones(self.path), [])
+        save_simulation(TrafficSimulation(), self.path)
+        self.assertEqual(len(load_simulation(self.path)), 0)
+
+    def test_simulation(self):
+        simulation = random_traffic(200, seed=3)
+        simulation.run(5)
+        save_simulation(simulation, self.path)
+        restored = load_simulation(self.path)
+        self.assertEqual(list(restored.x), list(simulation.x))
+        self.assertEqual(list(restored.speed), list(simulation.speed))
+        self.assertEqual([_scalars(v) for v in restored.vehicles],
+                         [_scalars(v) for v in simulation.vehicles])
+
+    def test_unknown_class_rejected_on_save(self):
+        class CustomPhone(Smartphone):
+            pass
+        with self.assertRaises(SnapshotError):
+            save_phones([CustomPhone("a", "b", "IMEI9")], self.path)
+
+    def test_corrupt_files(self):
+        save_vehicles([Car("a", "b", "Gasoline")], self.path)
+        with open(self.path, "rb") as file:
+            data = file.read()
+        for broken in (data[:10], data[:20], data[:len(data) - 8],
+                       data[:12] + b"{not json" + data[21:]):
+            with open(self.path, "wb") as file:
+                file.write(broken)
+            with self.assertRaises(SnapshotError):
+                load_vehicles(self.path)
+        with open(self.path, "wb") as file:
+            file.write(b"FLEETSNP" + struct.pack("<I", 10 ** 6))
+        with self.assertRaises(SnapshotError):
+            load_vehicles(self.path)
+
+
+if __name__ == "__main__":
+    unittest.main()
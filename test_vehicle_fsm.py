@@ -0,0 +1,285 @@
+"""
+Equivalence tests for the compiled vehicle state machines: random action
+sequences, mixed with direct attribute writes, must give the same results
+as the original attribute-checking methods
+"""
+
+import random
+import unittest
+
+from Assignment5b import Car, Motorcycle, Airplane, Boat, Bicycle, Helicopter
+from vehicle_fsm import apply_actions
+
+
+class Reference:
+    """The vehicle methods as written before the state machines"""
+
+    def __init__(self, brand, model, vehicle_type, fuel_type):
+        self.brand = brand
+        self.model = model
+        self.vehicle_type = vehicle_type
+        self.fuel_type = fuel_type
+        self.speed = 0
+        self.engine_on = False
+
+    def start_engine(self):
+        if not self.engine_on:
+            self.engine_on = True
+            return f"🔑 {self.brand} {self.model} engine started!"
+        return "⚠️ Engine is already running!"
+
+    def stop_engine(self):
+        if self.engine_on:
+            self.engine_on = False
+            self.speed = 0
+            return f"🔑 {self.brand} {self.model} engine stopped!"
+        return "⚠️ Engine is already off!"
+
+    def accelerate(self, amount):
+        if self.engine_on:
+            self.speed += amount
+            return f"🚀 Accelerating to {self.speed} km/h!"
+        return "❌ Cannot accelerate - engine is off!"
+
+    def brake(self, amount):
+        if self.speed > 0:
+            self.speed = max(0, self.speed - amount)
+            return f"🛑 Braking to {self.speed} km/h!"
+        return "⚠️ Vehicle is already stopped!"
+
+
+class ReferenceCar(Reference):
+
+    def __init__(self, brand, model, fuel_type, doors=4):
+        super().__init__(brand, model, "Car", fuel_type)
+        self.doors = doors
+        self.wheels = 4
+
+    def move(self):
+        if self.engine_on:
+            return f"🚗 {self.brand} {self.model} is driving on the road at {self.speed}km/h!"
+        return "❌ Car cannot move - start the engine first!"
+
+
+class ReferenceMotorcycle(Reference):
+
+    def __init__(self, brand, model, fuel_type, engine_size):
+        super().__init__(brand, model, "Motorcycle", fuel_type)
+        self.engine_size = engine_size
+        self.wheels = 2
+
+    def move(self):
+        if self.engine_on:
+            return f"🏍️ {self.brand} {self.model} is riding on the road at {self.speed}km/h!"
+        return "❌ Motorcycle cannot move - start the engine first!"
+
+    def do_wheelie(self):
+        if self.speed > 30:
+            return "🎯 Performing an awesome wheelie! 🤘"
+        return "❌ Too slow for a wheelie! Need more speed!"
+
+
+class ReferenceAirplane(Reference):
+
+    def __init__(self, brand, model, fuel_type, max_altitude):
+        super().__init__(brand, model, "Airplane", fuel_type)
+        self.max_altitude = max_altitude
+        self.altitude = 0
+        self.wingspan = "30m"
+
+    def move(self):
+        if self.engine_on and self.altitude > 0:
+            return f"✈️ {self.brand} {self.model} is flying at {self.altitude} feet, speed: {self.speed}km/h!"
+        elif self.engine_on:
+            return f"✈️ {self.brand} {self.model} is taxiing on runway at {self.speed}km/h!"
+        return "❌ Airplane cannot move - start the engine first!"
+
+    def take_off(self):
+        if self.engine_on and self.speed > 200:
+            self.altitude = 1000
+            return "🛫 Airplane taking off! Climbing to 1000 feet!"
+        return "❌ Not enough speed for takeoff! Need to accelerate more!"
+
+    def land(self):
+        if self.altitude > 0:
+            self.altitude = 0
+            self.speed = 50
+            return "🛬 Airplane landing! Descending to runway!"
+        return "⚠️ Airplane is already on ground!"
+
+    def increase_altitude(self, feet):
+        if self.engine_on and self.altitude > 0:
+            self.altitude = min(self.max_altitude, self.altitude + feet)
+            return f"📈 Climbing to {self.altitude} feet!"
+        return "❌ Must be airborne to change altitude!"
+
+
+class ReferenceBoat(Reference):
+
+    def __init__(self, brand, model, fuel_type, boat_type):
+        super().__init__(brand, model, "Boat", fuel_type)
+        self.boat_type = boat_type
+        self.anchor_down = True
+
+    def move(self):
+        if self.engine_on and not self.anchor_down:
+            return f"🚢 {self.brand} {self.model} is sailing on water at {self.speed} knots!"
+        elif self.engine_on:
+            return "⚠️ Boat cannot move - raise the anchor first!"
+        return "❌ Boat cannot move - start the engine first!"
+
+    def raise_anchor(self):
+        if self.anchor_down:
+            self.anchor_down = False
+            return "⚓ Anchor raised! Ready to sail!"
+        return "⚠️ Anchor is already raised!"
+
+    def drop_anchor(self):
+        if not self.anchor_down:
+            self.anchor_down = True
+            self.speed = 0
+            return "⚓ Anchor dropped! Boat secured!"
+        return "⚠️ Anchor is already down!"
+
+
+class ReferenceBicycle(Reference):
+
+    def __init__(self, brand, model, gears):
+        super().__init__(brand, model, "Bicycle", "Human Power")
+        self.gears = gears
+        self.wheels = 2
+        self.engine_on = True
+
+    def move(self):
+        if self.speed > 0:
+            return f"🚴 {self.brand} {self.model} is pedaling on the road at {self.speed}km/h!"
+        return "🚴 Bicycle is stationary - start pedaling!"
+
+    def start_engine(self):
+        return "✅ Bicycle is ready to pedal! No engine needed!"
+
+    def stop_engine(self):
+        return "✅ Bicycle stopped! No engine to turn off!"
+
+
+class ReferenceHelicopter(Reference):
+
+    def __init__(self, brand, model, fuel_type, rotor_diameter):
+        super().__init__(brand, model, "Helicopter", fuel_type)
+        self.rotor_diameter = rotor_diameter
+        self.altitude = 0
+        self.rotor_spinning = False
+
+    def move(self):
+        if self.rotor_spinning and self.altitude > 0:
+            return f"🚁 {self.brand} {self.model} is flying at {self.altitude} feet, speed: {self.speed}km/h!"
+        elif self.rotor_spinning:
+            return f"🚁 {self.brand} {self.model} is ready for takeoff on helipad!"
+        return "❌ Helicopter cannot move - start the rotors first!"
+
+    def start_engine(self):
+        self.engine_on = True
+        self.rotor_spinning = True
+        return f"🔑 {self.brand} {self.model} engine started! Rotors spinning! 🚁"
+
+    def stop_engine(self):
+        self.engine_on = False
+        self.rotor_spinning = False
+        self.altitude = 0
+        self.speed = 0
+        return f"🔑 {self.brand} {self.model} engine stopped! Rotors stopped! 🚁"
+
+    def take_off(self):
+        if self.rotor_spinning:
+            self.altitude = 500
+            return "🛫 Helicopter taking off! Hovering at 500 feet!"
+        return "❌ Rotors not spinning! Start engine first!"
+
+    def hover(self):
+        if self.altitude > 0:
+            self.speed = 0
+            return "🚁 Hovering in place! Maintaining altitude!"
+        return "❌ Must be airborne to hover!"
+
+
+# (vehicle class, reference class, constructor arguments)
+PAIRS = [
+    (Car, ReferenceCar, ("Toyota", "Camry", "Gasoline")),
+    (Motorcycle, ReferenceMotorcycle, ("Harley", "Iron 883", "Gasoline", 883)),
+    (Airplane, ReferenceAirplane, ("Boeing", "737", "Jet Fuel", 41000)),
+    (Boat, ReferenceBoat, ("Yamaha", "242X", "Gasoline", "Speedboat")),
+    (Bicycle, ReferenceBicycle, ("Trek", "FX 3", 21)),
+    (Helicopter, ReferenceHelicopter, ("Bell", "407", "Aviation Fuel", 10.7)),
+]
+
+# Public attributes a caller may write directly, and the values to try
+WRITES = {
+    "engine_on": (True, False),
+    "anchor_down": (True, False),
+    "rotor_spinning": (True, False),
+    "altitude": (0, 700),
+    "speed": (0, 40, 250),
+}
+
+ACTIONS_WITH_AMOUNT = ("accelerate", "brake", "increase_altitude")
+
+
+def _plain(vehicle):
+    return {name: value for name, value in vars(vehicle).items() if name != "state"}
+
+
+class StateMachineEquivalenceTest(unittest.TestCase):
+
+    def _steps(self, rng, reference, count):
+        """Random (kind, name, value) steps valid for reference's class"""
+        methods = [name for name in ("start_engine", "stop_engine", "accelerate", "brake",
+                                     "move", "do_wheelie", "take_off", "land",
+                                     "increase_altitude", "raise_anchor", "drop_anchor", "hover")
+                   if hasattr(reference, name)]
+        writable = [name for name in WRITES if hasattr(reference, name)]
+        steps = []
+        for _ in range(count):
+            if rng.random() < 0.2:
+                name = rng.choice(writable)
+                steps.append(("set", name, rng.choice(WRITES[name])))
+            else:
+                name = rng.choice(methods)
+                steps.append(("call", name, rng.choice((5, 40, 150, 300))))
+        return steps
+
+    def test_random_sequences_match_reference(self):
+        rng = random.Random(2024)
+        for vehicle_class, reference_class, args in PAIRS:
+            for trial in range(200):
+                vehicle, reference = vehicle_class(*args), reference_class(*args)
+                for kind, name, value in self._steps(rng, reference, 30):
+                    if kind == "set":
+                        setattr(vehicle, name, value)
+                        setattr(reference, name, value)
+                        continue
+                    call_args = (value,) if name in ACTIONS_WITH_AMOUNT else ()
+                    expected = getattr(reference, name)(*call_args)
+                    actual = getattr(vehicle, name)(*call_args)
+                    self.assertEqual(str(actual), expected,
+                                     f"{vehicle_class.__name__} trial {trial}: {name}")
+                    self.assertEqual(_plain(vehicle), _plain(reference),
+                                     f"{vehicle_class.__name__} trial {trial}: {name}")
+
+    def test_apply_actions_matches_single_calls(self):
+        rng = random.Random(7)
+        fleet = [vehicle_class(*args) for vehicle_class, _, args in PAIRS for _ in range(20)]
+        singles = [vehicle_class(*args) for vehicle_class, _, args in PAIRS for _ in range(20)]
+        for action in ("start_engine", "accelerate", "take_off", "raise_anchor",
+                       "move", "brake", "stop_engine"):
+            amounts = [rng.choice((5, 250)) for _ in fleet]
+            applied = apply_actions(fleet, action, amounts)
+            for i, vehicle in enumerate(singles):
+                if hasattr(vehicle, action) and action != "move":
+                    call_args = (amounts[i],) if action in ACTIONS_WITH_AMOUNT else ()
+                    getattr(vehicle, action)(*call_args)
+            self.assertEqual([_plain(v) for v in fleet], [_plain(v) for v in singles])
+            self.assertEqual(len(applied), len(fleet))
+
+
+if __name__ == "__main__":
+    unittest.main()
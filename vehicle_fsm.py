@@ -0,0 +1,354 @@
+"""
+Vehicle State Machines
+Declarative (state, action) -> (guard, next state) tables for each vehicle
+type, compiled to integer-indexed arrays so whole fleets can be checked
+and updated in one batch call
+"""
+
+from array import array
+from operator import attrgetter
+
+
+# Every action any vehicle can perform; action ids index the compiled tables
+ACTIONS = [
+    "start_engine", "stop_engine", "accelerate", "brake", "move",
+    "do_wheelie", "take_off", "land", "increase_altitude", "hover",
+    "raise_anchor", "drop_anchor",
+]
+ACTION_IDS = {action: i for i, action in enumerate(ACTIONS)}
+
+# Guards are (attribute, limit) pairs that pass when attribute > limit.
+# Guard id 0 means "no guard".
+MOVING = ("speed", 0)
+WHEELIE_SPEED = ("speed", 30)
+TAKEOFF_SPEED = ("speed", 200)
+GUARDS = [None, MOVING, WHEELIE_SPEED, TAKEOFF_SPEED]
+GUARD_IDS = {guard: i for i, guard in enumerate(GUARDS)}
+
+
+# Effects change the continuous state (speed, altitude) once a transition is allowed
+def _accelerate(vehicle, amount):
+    vehicle.speed += amount
+
+def _brake(vehicle, amount):
+    vehicle.speed = max(0, vehicle.speed - amount)
+
+def _stop(vehicle, amount):
+    vehicle.speed = 0
+
+def _stop_and_ground(vehicle, amount):
+    vehicle.speed = 0
+    vehicle.altitude = 0
+
+def _airplane_take_off(vehicle, amount):
+    vehicle.altitude = 1000
+
+def _helicopter_take_off(vehicle, amount):
+    vehicle.altitude = 500
+
+def _land(vehicle, amount):
+    vehicle.altitude = 0
+    vehicle.speed = 50
+
+def _climb(vehicle, amount):
+    vehicle.altitude = min(vehicle.max_altitude, vehicle.altitude + amount)
+
+DEFAULT_EFFECTS = {
+    "stop_engine": _stop,
+    "accelerate": _accelerate,
+    "brake": _brake,
+    "hover": _stop,
+    "drop_anchor": _stop,
+}
+
+
+class StateMachine:
+    """
+    Compiled transition table for one vehicle type.
+    states maps each state name to (attribute values set on entry,
+    airborne) where airborne is True/False when the state implies
+    altitude > 0 or == 0, and None when altitude doesn't matter.
+    """
+
+    def __init__(self, states, initial, transitions, effects=None):
+        self.state_names = list(states)
+        self.state_ids = {name: i for i, name in enumerate(self.state_names)}
+        self.initial = self.state_ids[initial]
+        self.entry_values = [states[name][0] for name in self.state_names]
+        self.airborne = [states[name][1] for name in self.state_names]
+
+        # Every state sets the same attributes, so a vehicle's state is
+        # determined by one key: those attribute values, plus altitude > 0
+        # for machines whose states say whether the vehicle is airborne.
+        # current() then needs a single comparison against keys[state].
+        attributes = tuple(self.entry_values[0])
+        if any(tuple(values) != attributes for values in self.entry_values):
+            raise ValueError("every state must set the same attributes")
+        flying = [airborne is not None for airborne in self.airborne]
+        if any(flying) and not all(flying):
+            raise ValueError("either every state or no state may depend on altitude")
+        getter = attrgetter(*attributes)
+        if all(flying):
+            self.key = lambda vehicle: (getter(vehicle), getattr(vehicle, "altitude", 0) > 0)
+        else:
+            self.key = getter
+        self.keys = []
+        for values, airborne in zip(self.entry_values, self.airborne):
+            key = tuple(values.values()) if len(attributes) > 1 else values[attributes[0]]
+            self.keys.append((key, airborne) if airborne is not None else key)
+        self.state_for_key = {}
+        for state, key in enumerate(self.keys):
+            self.state_for_key.setdefault(key, state)
+
+        size = len(self.state_names) * len(ACTIONS)
+        self.next_state = array('b', [-1] * size)
+        self.guard = array('B', [0] * size)
+        for (state, action), (guard, next_state) in transitions.items():
+            slot = self.state_ids[state] * len(ACTIONS) + ACTION_IDS[action]
+            self.next_state[slot] = self.state_ids[next_state]
+            self.guard[slot] = GUARD_IDS[guard]
+
+        merged = dict(DEFAULT_EFFECTS, **(effects or {}))
+        self.effects = [merged.get(action) for action in ACTIONS]
+        # The same table as one (next state, guard, effect) tuple per slot,
+        # or None when the action isn't allowed, for the per-call fire()
+        self.width = len(ACTIONS)
+        self.rules = [None if self.next_state[slot] < 0 else
+                      (self.next_state[slot], GUARDS[self.guard[slot]],
+                       self.effects[slot % self.width])
+                      for slot in range(size)]
+
+    def current(self, vehicle):
+        """
+        vehicle.state, re-derived first if the public attributes it depends
+        on (engine_on, anchor_down, altitude, ...) were written directly
+        """
+        state = vehicle.state
+        if self.key(vehicle) != self.keys[state]:
+            state = vehicle.state = self.classify(vehicle)
+        return state
+
+    def allows(self, vehicle, action_id):
+        """Next state id if action_id is allowed for vehicle right now, else -1"""
+        slot = self.current(vehicle) * self.width + action_id
+        next_state = self.next_state[slot]
+        if next_state >= 0:
+            guard = self.guard[slot]
+            if guard:
+                attribute, limit = GUARDS[guard]
+                if not getattr(vehicle, attribute) > limit:
+                    return -1
+        return next_state
+
+    def fire(self, vehicle, action_id, amount=None):
+        """Check and apply action_id; returns True if it was allowed"""
+        state = vehicle.state
+        if self.key(vehicle) != self.keys[state]:
+            state = vehicle.state = self.classify(vehicle)
+        rule = self.rules[state * self.width + action_id]
+        if rule is None:
+            return False
+        next_state, guard, effect = rule
+        if guard is not None and not getattr(vehicle, guard[0]) > guard[1]:
+            return False
+        if next_state != state:
+            self.enter(vehicle, next_state)
+        if effect is not None:
+            effect(vehicle, amount)
+        return True
+
+    def enter(self, vehicle, state):
+        """Move vehicle into state and set the attributes that state implies"""
+        vehicle.state = state
+        for attribute, value in self.entry_values[state].items():
+            setattr(vehicle, attribute, value)
+
+    def classify(self, vehicle):
+        """Work out the state id from a vehicle's attributes"""
+        return self.state_for_key.get(self.key(vehicle), self.initial)
+
+
+def _everywhere(states, action, guard, transitions):
+    """Add a self-loop for action to every state"""
+    for state in states:
+        transitions.setdefault((state, action), (guard, state))
+
+
+def _road_machine(extra=None):
+    states = {"off": ({"engine_on": False}, None), "running": ({"engine_on": True}, None)}
+    transitions = {
+        ("off", "start_engine"): (None, "running"),
+        ("running", "stop_engine"): (None, "off"),
+        ("running", "accelerate"): (None, "running"),
+        ("running", "move"): (None, "running"),
+    }
+    transitions.update(extra or {})
+    _everywhere(states, "brake", MOVING, transitions)
+    return StateMachine(states, "off", transitions)
+
+
+def _airplane_machine():
+    states = {
+        "off": ({"engine_on": False}, False),
+        "ground": ({"engine_on": True}, False),
+        "airborne": ({"engine_on": True}, True),
+        "off_airborne": ({"engine_on": False}, True),
+    }
+    transitions = {
+        ("off", "start_engine"): (None, "ground"),
+        ("ground", "stop_engine"): (None, "off"),
+        ("ground", "accelerate"): (None, "ground"),
+        ("ground", "take_off"): (TAKEOFF_SPEED, "airborne"),
+        ("ground", "move"): (None, "ground"),
+        ("airborne", "stop_engine"): (None, "off_airborne"),
+        ("airborne", "accelerate"): (None, "airborne"),
+        ("airborne", "take_off"): (TAKEOFF_SPEED, "airborne"),
+        ("airborne", "land"): (None, "ground"),
+        ("airborne", "increase_altitude"): (None, "airborne"),
+        ("airborne", "move"): (None, "airborne"),
+        ("off_airborne", "start_engine"): (None, "airborne"),
+        ("off_airborne", "land"): (None, "off"),
+    }
+    _everywhere(states, "brake", MOVING, transitions)
+    return StateMachine(states, "off", transitions,
+                        {"take_off": _airplane_take_off, "land": _land,
+                         "increase_altitude": _climb})
+
+
+def _boat_machine():
+    states = {
+        "off_anchored": ({"engine_on": False, "anchor_down": True}, None),
+        "off_free": ({"engine_on": False, "anchor_down": False}, None),
+        "anchored": ({"engine_on": True, "anchor_down": True}, None),
+        "sailing": ({"engine_on": True, "anchor_down": False}, None),
+    }
+    transitions = {
+        ("off_anchored", "start_engine"): (None, "anchored"),
+        ("off_anchored", "raise_anchor"): (None, "off_free"),
+        ("off_free", "start_engine"): (None, "sailing"),
+        ("off_free", "drop_anchor"): (None, "off_anchored"),
+        ("anchored", "stop_engine"): (None, "off_anchored"),
+        ("anchored", "accelerate"): (None, "anchored"),
+        ("anchored", "raise_anchor"): (None, "sailing"),
+        ("sailing", "stop_engine"): (None, "off_free"),
+        ("sailing", "accelerate"): (None, "sailing"),
+        ("sailing", "drop_anchor"): (None, "anchored"),
+        ("sailing", "move"): (None, "sailing"),
+    }
+    _everywhere(states, "brake", MOVING, transitions)
+    return StateMachine(states, "off_anchored", transitions)
+
+
+def _bicycle_machine():
+    # "parked" only arises when engine_on is cleared directly; move and
+    # brake don't depend on it, accelerate does
+    states = {"riding": ({"engine_on": True}, None), "parked": ({"engine_on": False}, None)}
+    transitions = {
+        ("riding", "accelerate"): (None, "riding"),
+        ("riding", "move"): (None, "riding"),
+        ("parked", "move"): (None, "parked"),
+    }
+    _everywhere(states, "brake", MOVING, transitions)
+    return StateMachine(states, "riding", transitions)
+
+
+def _helicopter_machine():
+    # engine_on and rotor_spinning normally change together (off / ready /
+    # airborne) but are separate public attributes, so every combination
+    # is a state. The first three keep their ids for existing snapshots.
+    names = {
+        (False, False, False): "off",
+        (True, True, False): "ready",
+        (True, True, True): "airborne",
+        (False, False, True): "off_airborne",
+        (True, False, False): "engine_only",
+        (True, False, True): "engine_only_airborne",
+        (False, True, False): "rotor_only",
+        (False, True, True): "rotor_only_airborne",
+    }
+    states = {name: ({"engine_on": engine, "rotor_spinning": rotor}, airborne)
+              for (engine, rotor, airborne), name in names.items()}
+    transitions = {}
+    for (engine, rotor, airborne), state in names.items():
+        transitions[(state, "start_engine")] = (None, names[(True, True, airborne)])
+        transitions[(state, "stop_engine")] = (None, "off")
+        if rotor:
+            transitions[(state, "take_off")] = (None, names[(engine, rotor, True)])
+            transitions[(state, "move")] = (None, state)
+        if airborne:
+            transitions[(state, "hover")] = (None, state)
+        if engine:
+            transitions[(state, "accelerate")] = (None, state)
+    _everywhere(states, "brake", MOVING, transitions)
+    return StateMachine(states, "off", transitions,
+                        {"stop_engine": _stop_and_ground, "take_off": _helicopter_take_off})
+
+
+# Compiled machines keyed by vehicle class name. Subclasses use the machine
+# of their nearest listed ancestor; any other Vehicle gets DEFAULT_MACHINE.
+MACHINES = {
+    "Car": _road_machine(),
+    "Motorcycle": _road_machine({("running", "do_wheelie"): (WHEELIE_SPEED, "running"),
+                                 ("off", "do_wheelie"): (WHEELIE_SPEED, "off")}),
+    "Airplane": _airplane_machine(),
+    "Boat": _boat_machine(),
+    "Bicycle": _bicycle_machine(),
+    "Helicopter": _helicopter_machine(),
+}
+DEFAULT_MACHINE = _road_machine()
+
+_class_machines = {}                           # vehicle class -> StateMachine, filled on first use
+
+
+def machine_for(vehicle_class):
+    """StateMachine for a vehicle class, resolved through its MRO"""
+    machine = _class_machines.get(vehicle_class)
+    if machine is None:
+        machine = next((MACHINES[klass.__name__] for klass in vehicle_class.__mro__
+                        if klass.__name__ in MACHINES), DEFAULT_MACHINE)
+        _class_machines[vehicle_class] = machine
+    return machine
+
+
+def initial_state(vehicle_class):
+    return machine_for(vehicle_class).initial
+
+
+def state_name(vehicle):
+    return machine_for(type(vehicle)).state_names[vehicle.state]
+
+
+def allows(vehicle, action):
+    """Whether vehicle can perform action right now (nothing is changed)"""
+    return machine_for(type(vehicle)).allows(vehicle, ACTION_IDS[action]) >= 0
+
+
+def fire(vehicle, action, amount=None):
+    """Check and apply one transition; returns True if it was allowed"""
+    return machine_for(type(vehicle)).fire(vehicle, ACTION_IDS[action], amount)
+
+
+def resync(vehicle):
+    """Re-derive a vehicle's state after its attributes were set directly"""
+    vehicle.state = machine_for(type(vehicle)).classify(vehicle)
+
+
+def apply_actions(vehicles, actions, amounts=None):
+    """
+    Check and apply one action per vehicle for a whole fleet.
+    actions is a single action name for every vehicle or one name per
+    vehicle; amounts likewise. Returns array('B') of 1 (applied) / 0
+    (rejected) flags in vehicle order.
+    """
+    count = len(vehicles)
+    if isinstance(actions, str):
+        action_ids = [ACTION_IDS[actions]] * count
+    else:
+        action_ids = [ACTION_IDS[action] for action in actions]
+    if amounts is None or isinstance(amounts, (int, float)):
+        amounts = [amounts] * count
+    applied = array('B', bytes(count))
+    for i, vehicle in enumerate(vehicles):
+        if machine_for(type(vehicle)).fire(vehicle, action_ids[i], amounts[i]):
+            applied[i] = 1
+    return applied
@@ -0,0 +1,246 @@
+"""
+Time-Stepped Traffic Simulation
+Tracks position, speed and altitude for large fleets of Assignment5b vehicles
+stored column-wise (structure of arrays) and advanced one tick at a time
+"""
+
+import math
+import random
+import time
+from array import array
+from collections import namedtuple
+
+from Assignment5b import Car, Motorcycle, Airplane, Boat, Bicycle, Helicopter
+from vehicle_fsm import resync
+
+
+# Per-type motion parameters
+#   cruise_speed / max_speed : km/h
+#   acceleration             : default km/h gained or lost per simulated second
+#   takeoff_speed            : km/h needed to climb (None for ground/water vehicles)
+#   climb_rate               : feet per simulated second
+#   ceiling                  : default maximum altitude in feet
+MotionRule = namedtuple("MotionRule", [
+    "cruise_speed", "max_speed", "acceleration", "takeoff_speed", "climb_rate", "ceiling",
+])
+
+MOTION_RULES = {
+    Car:        MotionRule(90, 250, 3.0, None, 0, 0),
+    Motorcycle: MotionRule(100, 300, 5.0, None, 0, 0),
+    Airplane:   MotionRule(800, 950, 4.0, 200, 30, 35000),
+    Boat:       MotionRule(40, 100, 1.0, None, 0, 0),
+    Bicycle:    MotionRule(20, 45, 1.5, None, 0, 0),
+    Helicopter: MotionRule(200, 260, 3.0, 0, 15, 5000),
+}
+
+VEHICLE_TYPES = list(MOTION_RULES)
+
+_class_kinds = {}                              # vehicle class -> index into VEHICLE_TYPES
+
+
+def vehicle_kind(vehicle_class):
+    """
+    Index into VEHICLE_TYPES for a vehicle class; subclasses use the entry
+    of their nearest ancestor in VEHICLE_TYPES
+    """
+    kind = _class_kinds.get(vehicle_class)
+    if kind is None:
+        kind = next((VEHICLE_TYPES.index(klass) for klass in vehicle_class.__mro__
+                     if klass in MOTION_RULES), None)
+        if kind is None:
+            raise TypeError(f"{vehicle_class.__name__} is not derived from a simulated "
+                            f"vehicle type ({', '.join(t.__name__ for t in VEHICLE_TYPES)})")
+        _class_kinds[vehicle_class] = kind
+    return kind
+
+
+def is_active(vehicle):
+    """Whether a vehicle is in a state where it can move"""
+    if isinstance(vehicle, Boat):
+        return vehicle.engine_on and not vehicle.anchor_down
+    if isinstance(vehicle, Helicopter):
+        return vehicle.rotor_spinning
+    return vehicle.engine_on
+
+
+class TrafficSimulation:
+    """
+    Fleet state kept in parallel typed arrays, one entry per vehicle.
+    Vehicles are grouped by type so each tick applies one motion rule to
+    a whole group in a tight loop instead of dispatching per vehicle.
+    Positions are in km on a flat plane, altitude in feet.
+    """
+
+    def __init__(self, vehicles=(), dt=1.0):
+        self.dt = dt
+        self.ticks = 0
+        self.vehicles = []
+        self.kind = array('B')                 # index into VEHICLE_TYPES
+        self.active = array('B')
+        self.x = array('d')
+        self.y = array('d')
+        self.heading_x = array('d')            # unit heading vector
+        self.heading_y = array('d')
+        self.speed = array('d')
+        self.target_speed = array('d')
+        self.acceleration = array('d')         # km/h per simulated second
+        self.altitude = array('d')
+        self.ceiling = array('d')
+        self._groups = {kind: array('L') for kind in range(len(VEHICLE_TYPES))}
+        self.observers = []                    # callables run with the simulation after each tick
+        for vehicle in vehicles:
+            self.add(vehicle)
+
+    def __len__(self):
+        return len(self.vehicles)
+
+    def add(self, vehicle, x=0.0, y=0.0, heading=0.0, target_speed=None, acceleration=None):
+        """
+        Add a vehicle at (x, y) facing heading (radians); returns its index.
+        target_speed and acceleration default to the vehicle type's motion rule.
+        """
+        kind = vehicle_kind(type(vehicle))
+        rule = MOTION_RULES[VEHICLE_TYPES[kind]]
+        index = len(self.vehicles)
+        self.vehicles.append(vehicle)
+        self.kind.append(kind)
+        self.active.append(is_active(vehicle))
+        self.x.append(x)
+        self.y.append(y)
+        self.heading_x.append(math.cos(heading))
+        self.heading_y.append(math.sin(heading))
+        self.speed.append(vehicle.speed)
+        self.target_speed.append(rule.cruise_speed if target_speed is None
+                                 else min(target_speed, rule.max_speed))
+        self.acceleration.append(rule.acceleration if acceleration is None else acceleration)
+        self.altitude.append(getattr(vehicle, "altitude", 0))
+        self.ceiling.append(getattr(vehicle, "max_altitude", rule.ceiling))
+        self._groups[kind].append(index)
+        return index
+
+    def set_target_speed(self, index, speed):
+        rule = MOTION_RULES[VEHICLE_TYPES[self.kind[index]]]
+        self.target_speed[index] = max(0, min(speed, rule.max_speed))
+
+    def refresh_state(self):
+        """Re-read engine/anchor/rotor state from the vehicle objects"""
+        for index, vehicle in enumerate(self.vehicles):
+            self.active[index] = is_active(vehicle)
+
+    def position(self, index):
+        return self.x[index], self.y[index], self.altitude[index]
+
+    def step(self):
+        """Advance every vehicle by one tick of dt simulated seconds"""
+        dt = self.dt
+        hours = dt / 3600.0
+        active = self.active
+        speed = self.speed
+        target_speed = self.target_speed
+        acceleration = self.acceleration
+        altitude = self.altitude
+        ceiling = self.ceiling
+        x, y = self.x, self.y
+        heading_x, heading_y = self.heading_x, self.heading_y
+
+        for kind, indexes in self._groups.items():
+            if not indexes:
+                continue
+            rule = MOTION_RULES[VEHICLE_TYPES[kind]]
+            takeoff_speed = rule.takeoff_speed
+            climb = rule.climb_rate * dt
+            for i in indexes:
+                if not active[i]:
+                    continue
+                v = speed[i]
+                target = target_speed[i]
+                if v < target:
+                    v = min(target, v + acceleration[i] * dt)
+                elif v > target:
+                    v = max(target, v - acceleration[i] * dt)
+                speed[i] = v
+                if takeoff_speed is not None:
+                    if v >= takeoff_speed:
+                        altitude[i] = min(ceiling[i], altitude[i] + climb)
+                    elif altitude[i] > 0:
+                        altitude[i] = max(0.0, altitude[i] - climb)
+                distance = v * hours
+                x[i] += distance * heading_x[i]
+                y[i] += distance * heading_y[i]
+        self.ticks += 1
+        for observer in self.observers:
+            observer(self)
+
+    def run(self, ticks):
+        for _ in range(ticks):
+            self.step()
+
+    def sync_to_vehicles(self):
+        """Write simulated speed and altitude back onto the vehicle objects"""
+        for index, vehicle in enumerate(self.vehicles):
+            vehicle.speed = round(self.speed[index])
+            if hasattr(vehicle, "altitude"):
+                vehicle.altitude = round(self.altitude[index])
+            resync(vehicle)
+
+
+def random_vehicle(rng, serial=0):
+    """Create one vehicle of a random type with its engine started"""
+    vehicle_type = rng.choice(VEHICLE_TYPES)
+    if vehicle_type is Car:
+        vehicle = Car("Toyota", f"Camry-{serial}", "Gasoline", 4)
+    elif vehicle_type is Motorcycle:
+        vehicle = Motorcycle("Ducati", f"Panigale-{serial}", "Gasoline", 1100)
+    elif vehicle_type is Airplane:
+        vehicle = Airplane("Cessna", f"172-{serial}", "Avgas", 10000)
+    elif vehicle_type is Boat:
+        vehicle = Boat("Yamaha", f"242X-{serial}", "Gasoline", "Speedboat")
+        vehicle.raise_anchor()
+    elif vehicle_type is Bicycle:
+        vehicle = Bicycle("Trek", f"FX-{serial}", 21)
+    else:
+        vehicle = Helicopter("Bell", f"407-{serial}", "Aviation Fuel", 10.7)
+    vehicle.start_engine()
+    return vehicle
+
+
+def random_traffic(size, seed=0, area_km=100.0, dt=1.0):
+    """Build a seeded simulation of size random vehicles scattered over an area"""
+    rng = random.Random(seed)
+    simulation = TrafficSimulation(dt=dt)
+    for serial in range(size):
+        simulation.add(random_vehicle(rng, serial),
+                       rng.uniform(0, area_km), rng.uniform(0, area_km),
+                       rng.uniform(0, 2 * math.pi))
+    return simulation
+
+
+def ticks_per_second(simulation, ticks=10):
+    """Wall-clock ticks per second for an existing simulation"""
+    start = time.perf_counter()
+    simulation.run(ticks)
+    return ticks / (time.perf_counter() - start)
+
+
+def demonstrate_traffic(size=100_000, ticks=10, seed=42):
+    """Simulate a mixed fleet and report throughput and a sample of positions"""
+    print("=" * 60)
+    print("TRAFFIC SIMULATION")
+    print("=" * 60)
+
+    simulation = random_traffic(size, seed)
+    rate = ticks_per_second(simulation, ticks)
+    print(f"Vehicles: {size:,}  Ticks: {ticks}  Speed: {rate:.2f} ticks/s "
+          f"({rate * size:,.0f} vehicle-updates/s)")
+
+    print("\nSAMPLE POSITIONS:")
+    print("-" * 40)
+    for index in range(min(6, size)):
+        x, y, altitude = simulation.position(index)
+        print(f"{simulation.vehicles[index]}: ({x:.2f}, {y:.2f}) km, "
+              f"{simulation.speed[index]:.0f} km/h, {altitude:.0f} ft")
+
+
+# Main execution
+if __name__ == "__main__":
+    demonstrate_traffic()